@@ -1,11 +1,12 @@
 """GET /v1/health endpoint implementation."""
 
 import logging
-from fastapi import APIRouter, Response as FastAPIResponse
+from fastapi import APIRouter
 
 from app.models.responses import HealthResponse
 from app.services.health import check_health, get_uptime_seconds
 from app.config.settings import settings
+from app.utils.responses import ORJSONResponse
 from app.utils.timing import get_current_timestamp_iso
 
 logger = logging.getLogger(__name__)
@@ -16,7 +17,7 @@ router = APIRouter()
 @router.get(
     "/health",
     response_model=HealthResponse,
-    response_model_exclude_none=True,
+    response_class=ORJSONResponse,
     responses={
         200: {"description": "All systems operational"},
         503: {"description": "One or more critical components unavailable"},
@@ -25,48 +26,39 @@ router = APIRouter()
     description="Check the health status of the API and its components",
     tags=["Health"],
 )
-async def health(response: FastAPIResponse) -> HealthResponse:
+async def health() -> ORJSONResponse:
     """
     Health check endpoint.
 
     Returns:
-        HealthResponse: Health status of all components
-
-    Sets:
-        response.status_code: 200 for healthy, 503 for degraded
+        ORJSONResponse: Health status of all components (HealthResponse schema),
+            with status 200 for healthy and 503 for degraded
     """
     try:
         # Check health of all components
         overall_status, components = await check_health()
 
-        # Set status code based on health
-        if overall_status == "degraded":
-            response.status_code = 503
-
-        # Create response
-        health_response = HealthResponse(
-            status=overall_status,
-            timestamp=get_current_timestamp_iso(),
-            uptime_seconds=round(get_uptime_seconds(), 2),
-            components=components,
-            version=settings.api_version,
-        )
+        # Plain dicts skip Pydantic validation; the schema is documented via response_model
+        content = {
+            "status": overall_status,
+            "timestamp": get_current_timestamp_iso(),
+            "uptime_seconds": round(get_uptime_seconds(), 2),
+            "components": components,
+            "version": settings.api_version,
+        }
 
-        return health_response
+        return ORJSONResponse(content, status_code=503 if overall_status == "degraded" else 200)
 
     except Exception as e:
         logger.error(f"Error in health endpoint: {e}")
-        response.status_code = 503
 
         # Return minimal degraded response
-        from app.models.responses import ComponentStatus
+        content = {
+            "status": "unhealthy",
+            "timestamp": get_current_timestamp_iso(),
+            "uptime_seconds": round(get_uptime_seconds(), 2),
+            "components": {"api": {"status": "error"}},
+            "version": settings.api_version,
+        }
 
-        return HealthResponse(
-            status="unhealthy",
-            timestamp=get_current_timestamp_iso(),
-            uptime_seconds=round(get_uptime_seconds(), 2),
-            components={
-                "api": ComponentStatus(status="error"),
-            },
-            version=settings.api_version,
-        )
\ No newline at end of file
+        return ORJSONResponse(content, status_code=503)
@@ -1,6 +1,6 @@
 """Category mappings and default thresholds for moderation."""
 
-from typing import Dict
+from typing import Dict, Tuple
 
 # Default category thresholds
 DEFAULT_THRESHOLDS: Dict[str, float] = {
@@ -12,8 +12,11 @@ DEFAULT_THRESHOLDS: Dict[str, float] = {
     "violence": 0.6,
 }
 
-# Category list
-CATEGORIES = list(DEFAULT_THRESHOLDS.keys())
+# Category names; also the fixed column order of score/threshold vectors
+CATEGORIES: Tuple[str, ...] = tuple(DEFAULT_THRESHOLDS)
+
+# Column index of each category in score/threshold vectors
+CATEGORY_INDEX: Dict[str, int] = {category: i for i, category in enumerate(CATEGORIES)}
 
 # Model category mappings for toxic-bert
 # Maps model output labels to our standard categories
@@ -1,5 +1,6 @@
 """Application settings and configuration management."""
 
+from functools import cached_property
 from typing import List, Optional
 from pydantic_settings import BaseSettings
 from pydantic import Field
@@ -20,6 +21,21 @@ class Settings(BaseSettings):
     default_model: str = Field(default="unitary/toxic-bert", alias="DEFAULT_MODEL")
     model_cache_dir: str = Field(default="./models_cache", alias="MODEL_CACHE_DIR")
     lazy_load_model: bool = Field(default=True, alias="LAZY_LOAD_MODEL")
+    # "torch" or "onnx" (ONNX Runtime with INT8 quantization; needs optimum[onnxruntime])
+    model_backend: str = Field(default="torch", alias="MODEL_BACKEND")
+    # Cross-request micro-batching of inference
+    inference_batch_max_size: int = Field(default=32, alias="INFERENCE_BATCH_MAX_SIZE")
+    inference_batch_wait_ms: float = Field(default=5.0, alias="INFERENCE_BATCH_WAIT_MS")
+    # Run inference in this many spawned worker processes (0: threads in the serving process)
+    inference_workers: int = Field(default=0, alias="INFERENCE_WORKERS")
+    # Dynamic INT8 quantization of Linear layers when running on CPU
+    model_quantize_cpu: bool = Field(default=True, alias="MODEL_QUANTIZE_CPU")
+    # Run on GPU in bf16 (fp16 where unsupported); can change flags for scores near thresholds
+    model_half_precision_gpu: bool = Field(default=False, alias="MODEL_HALF_PRECISION_GPU")
+    # PyTorch intra-op CPU threads (unset: half the logical cores, i.e. physical cores)
+    torch_intra_op_threads: Optional[int] = Field(default=None, alias="TORCH_INTRA_OP_THREADS")
+    # Trace the torch model with TorchScript at load (inputs are then padded to 512 tokens)
+    model_jit_trace: bool = Field(default=False, alias="MODEL_JIT_TRACE")
 
     # Redis Configuration
     redis_host: str = Field(default="localhost", alias="REDIS_HOST")
@@ -30,15 +46,22 @@ class Settings(BaseSettings):
     redis_socket_timeout: int = Field(default=5, alias="REDIS_SOCKET_TIMEOUT")
     redis_socket_connect_timeout: int = Field(default=5, alias="REDIS_SOCKET_CONNECT_TIMEOUT")
     redis_retry_on_timeout: bool = Field(default=True, alias="REDIS_RETRY_ON_TIMEOUT")
+    redis_health_check_interval: int = Field(default=30, alias="REDIS_HEALTH_CHECK_INTERVAL")
 
     # Rate Limiting
     rate_limit_enabled: bool = Field(default=True, alias="RATE_LIMIT_ENABLED")
     rate_limit_requests: int = Field(default=100, alias="RATE_LIMIT_REQUESTS")
     rate_limit_window_seconds: int = Field(default=60, alias="RATE_LIMIT_WINDOW_SECONDS")
+    # "window_counter" (two-bucket counter) or "sliding_log" (per-request sorted set)
+    rate_limit_strategy: str = Field(default="window_counter", alias="RATE_LIMIT_STRATEGY")
 
     # Caching
     cache_enabled: bool = Field(default=True, alias="CACHE_ENABLED")
     cache_ttl_seconds: int = Field(default=3600, alias="CACHE_TTL_SECONDS")
+    cache_max_body_bytes: int = Field(default=1048576, alias="CACHE_MAX_BODY_BYTES")
+    # In-process LRU of text scores (0 disables); longer texts are not kept in memory
+    inproc_cache_size: int = Field(default=4096, alias="INPROC_CACHE_SIZE")
+    inproc_cache_max_text_length: int = Field(default=2048, alias="INPROC_CACHE_MAX_TEXT_LENGTH")
 
     # Default Thresholds
     threshold_harassment: float = Field(default=0.7, alias="THRESHOLD_HARASSMENT")
@@ -51,7 +74,7 @@ class Settings(BaseSettings):
     # CORS
     cors_origins: str = Field(default='["http://localhost:3000"]', alias="CORS_ORIGINS")
 
-    @property
+    @cached_property
     def cors_origins_list(self) -> List[str]:
         """Parse CORS origins from JSON string."""
         try:
@@ -59,9 +82,9 @@ class Settings(BaseSettings):
         except json.JSONDecodeError:
             return ["http://localhost:3000"]
 
-    @property
+    @cached_property
     def default_thresholds(self) -> dict:
-        """Get default thresholds as a dictionary."""
+        """Get default thresholds as a dictionary (built once; treat as read-only)."""
         return {
             "harassment": self.threshold_harassment,
             "hate": self.threshold_hate,
@@ -10,9 +10,12 @@ from app.config.settings import settings
 from app.api.v1 import moderate, health
 from app.middleware.logging import LoggingMiddleware
 from app.middleware.rate_limit import RateLimitMiddleware
-from app.middleware.cache import CacheMiddleware
+from app.middleware.cache import GZIP_COMPRESS_LEVEL, GZIP_MINIMUM_SIZE, CacheMiddleware
+from app.services.moderation import warm_up_model
+from app.services.inference_pool import shutdown_inference_pool
 from app.utils.redis_client import init_redis_pool, close_redis_pool
 from app.utils.colored_logging import ColoredFormatter
+from app.utils.responses import ORJSONResponse
 
 # Configure logging with colors
 logging.basicConfig(
@@ -46,14 +49,19 @@ async def lifespan(app: FastAPI):
     logger.info(f"Environment: {settings.env}")
     logger.info(f"API Version: {settings.api_version}")
 
-    # Initialize Redis connection pool
-    init_redis_pool()
+    # Initialize Redis connection pool (shared via get_redis_client())
+    await init_redis_pool()
+
+    # Load the model up front unless lazy loading is configured
+    if not settings.lazy_load_model:
+        await warm_up_model()
 
     yield
 
     # Shutdown
     logger.info("Shutting down Moderation API...")
-    close_redis_pool()
+    await close_redis_pool()
+    shutdown_inference_pool()
 
 
 # Create FastAPI application
@@ -65,6 +73,7 @@ app = FastAPI(
     redoc_url="/redoc",
     openapi_url="/openapi.json",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -76,12 +85,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Add GZip compression middleware
-app.add_middleware(GZipMiddleware, minimum_size=1000)
-
 # Add custom middleware (order matters - last added is executed first)
-# So we add in reverse order: logging -> rate limit -> cache
+# So we add in reverse order: logging -> rate limit -> gzip -> cache
 app.add_middleware(CacheMiddleware)
+# Compresses responses that bypass the cache; cache responses that already carry
+# Content-Encoding, or were decompressed for the client, pass through unchanged
+app.add_middleware(
+    GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE, compresslevel=GZIP_COMPRESS_LEVEL
+)
 app.add_middleware(RateLimitMiddleware)
 app.add_middleware(LoggingMiddleware)
 
@@ -110,4 +121,6 @@ if __name__ == "__main__":
         port=settings.api_port,
         reload=settings.env == "development",
         log_level=settings.log_level.lower(),
+        loop="uvloop",
+        http="httptools",
     )
\ No newline at end of file
@@ -1,49 +1,63 @@
 """Redis-based response caching middleware."""
 
+import gzip
 import logging
-import json
-import hashlib
-import base64
-from typing import Callable
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from typing import Dict, List
+import orjson
+from fastapi import Response
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.config.settings import settings
 from app.utils.redis_client import get_redis_client
+from app.utils.hashing import new_hasher
 
 logger = logging.getLogger(__name__)
 
+# Bodies smaller than this are stored and served uncompressed
+GZIP_MINIMUM_SIZE = 1000
 
-class CacheMiddleware(BaseHTTPMiddleware):
-    """Middleware for Redis-based response caching."""
+# Fast compression level: compressed once per cache miss, on the request path
+GZIP_COMPRESS_LEVEL = 1
+
+# Headers recomputed for every served response
+_ENCODING_HEADERS = {"content-length", "content-encoding", "vary"}
+
+
+class CacheMiddleware:
+    """Pure ASGI middleware for Redis-based response caching."""
 
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
+        self.app = app
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Check cache before processing request, store response after.
 
         Args:
-            request: Incoming request
-            call_next: Next middleware in chain
-
-        Returns:
-            Response: Cached or fresh response
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
         """
-        # Only cache GET requests to /v1/moderate (or POST with specific logic)
-        # For moderation API, we'll cache POST requests based on content hash
-        if request.method != "POST" or not request.url.path.startswith("/v1/moderate"):
-            return await call_next(request)
+        # For moderation API, we cache POST requests based on content hash
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or not scope["path"].startswith("/v1/moderate")
+        ):
+            await self.app(scope, receive, send)
+            return
 
         # Skip caching if disabled
         if not settings.cache_enabled:
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
         # Check for cache bypass header
-        if request.headers.get("X-No-Cache") == "true":
-            return await call_next(request)
+        request_headers = Headers(scope=scope)
+        if request_headers.get("x-no-cache") == "true":
+            await self.app(scope, receive, send)
+            return
 
         # Get Redis client
         redis_client = get_redis_client()
@@ -51,101 +65,210 @@ class CacheMiddleware(BaseHTTPMiddleware):
         # If Redis is unavailable, skip caching (graceful degradation)
         if redis_client is None:
             logger.debug("Redis unavailable, skipping cache")
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
+
+        # Skip caching for large bodies without reading them; a malformed
+        # Content-Length is left for the streaming size check below
+        try:
+            content_length = int(request_headers.get("content-length", 0))
+        except ValueError:
+            content_length = 0
+        if content_length > settings.cache_max_body_bytes:
+            logger.debug("Request body too large, skipping cache")
+            await self.app(scope, receive, send)
+            return
+
+        # Read request body, hashing it as it streams in; bodies without a
+        # Content-Length (chunked) are capped by the bytes actually received
+        hasher = new_hasher()
+        chunks = []
+        body_size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunk = message.get("body", b"")
+            hasher.update(chunk)
+            chunks.append(chunk)
+            body_size += len(chunk)
+            more_body = message.get("more_body", False)
 
-        # Read request body
-        body = await request.body()
+            if body_size > settings.cache_max_body_bytes:
+                logger.debug("Request body too large, skipping cache")
+                await self.app(scope, _replay_receive(chunks, more_body, receive), send)
+                return
 
-        # IMPORTANT: We need to make the body available again for downstream handlers
-        # by creating a new receive function that returns the body
-        async def receive():
-            return {"type": "http.request", "body": body}
+        # Replay the buffered body once for downstream handlers, then defer to the client
+        replay_receive = _replay_receive(chunks, False, receive)
 
-        # Replace the request's receive with our custom one
-        request._receive = receive
+        # Create cache key from request body hash
+        cache_key = _create_cache_key(hasher.hexdigest())
+        accept_encoding = request_headers.get("accept-encoding", "")
 
         try:
-            # Create cache key from request body hash
-            cache_key = _create_cache_key(body)
-
-            # Try to get cached response
-            cached_response = redis_client.get(cache_key)
-            if cached_response:
-                logger.info(f"[CACHE HIT] key: {cache_key}")
-                # Parse cached response
-                cached_data = json.loads(cached_response)
-                # Decode base64-encoded body back to bytes
-                response_body = base64.b64decode(cached_data["content"])
-                response = Response(
-                    content=response_body,
-                    status_code=cached_data["status_code"],
-                    headers=dict(cached_data["headers"]),
-                    media_type=cached_data.get("media_type", "application/json"),
+            # Try to get cached response (stored as a Redis hash)
+            cached_data = await redis_client.hgetall(cache_key)
+            if cached_data:
+                logger.info("[CACHE HIT] key: %s", cache_key)
+                response = _build_response(
+                    accept_encoding,
+                    content=cached_data[b"content"],
+                    gzipped=cached_data.get(b"encoding") == b"gzip",
+                    status_code=int(cached_data[b"status_code"]),
+                    headers=orjson.loads(cached_data[b"headers_json"]),
                 )
                 # Add cache header
                 response.headers["X-Cache"] = "HIT"
-                return response
+                await response(scope, replay_receive, send)
+                return
 
-            logger.info(f"[CACHE MISS] key: {cache_key}")
+            logger.info("[CACHE MISS] key: %s", cache_key)
 
         except Exception as e:
-            logger.error(f"Cache lookup error: {e}")
-
-        # Process request
-        response = await call_next(request)
-
-        # Cache successful responses
-        if response.status_code == 200:
-            try:
-                # Read response body
-                response_body = b""
-                async for chunk in response.body_iterator:
-                    response_body += chunk
-
-                # Create cache key
-                cache_key = _create_cache_key(body)
-
-                # Store in cache (encode bytes as base64 to handle both text and gzipped responses)
-                cache_data = {
-                    "content": base64.b64encode(response_body).decode("utf-8"),
-                    "status_code": response.status_code,
-                    "headers": dict(response.headers),
-                    "media_type": response.media_type,
-                }
-                redis_client.setex(
-                    cache_key,
-                    settings.cache_ttl_seconds,
-                    json.dumps(cache_data),
-                )
-                logger.info(f"[CACHE STORED] key: {cache_key}, TTL: {settings.cache_ttl_seconds}s")
-
-                # Return response with body
-                new_response = Response(
-                    content=response_body,
-                    status_code=response.status_code,
-                    headers=dict(response.headers),
-                    media_type=response.media_type,
-                )
-                # Add cache header
-                new_response.headers["X-Cache"] = "MISS"
-                return new_response
+            logger.error("Cache lookup error: %s", e)
+
+        # Process request; successful responses are buffered, others pass straight through
+        response_start: Message = {}
+        body_parts: List[bytes] = []
+        response_complete = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_complete
+            if message["type"] == "http.response.start":
+                response_start.update(message)
+                if message["status"] != 200:
+                    await send(message)
+            elif message["type"] == "http.response.body" and response_start.get("status") == 200:
+                body_parts.append(message.get("body", b""))
+                response_complete = not message.get("more_body", False)
+            else:
+                await send(message)
+
+        await self.app(scope, replay_receive, send_wrapper)
+
+        # Only cache successful responses
+        if response_start.get("status") != 200 or not response_complete:
+            return
+
+        # Join response chunks once instead of repeated concatenation
+        response_body = b"".join(body_parts)
+
+        # Compress once here; cache hits then serve the stored bytes as-is
+        gzipped = len(response_body) >= GZIP_MINIMUM_SIZE
+        content = (
+            gzip.compress(response_body, compresslevel=GZIP_COMPRESS_LEVEL)
+            if gzipped
+            else response_body
+        )
+        headers = {
+            name: value
+            for name, value in Headers(raw=response_start.get("headers", [])).items()
+            if name not in _ENCODING_HEADERS
+        }
+
+        try:
+            # Store body bytes in a hash
+            cache_data = {
+                "content": content,
+                "encoding": "gzip" if gzipped else "identity",
+                "status_code": 200,
+                "headers_json": orjson.dumps(headers),
+            }
+            pipe = redis_client.pipeline()
+            pipe.hset(cache_key, mapping=cache_data)
+            pipe.expire(cache_key, settings.cache_ttl_seconds)
+            await pipe.execute()
+            logger.info(
+                "[CACHE STORED] key: %s, TTL: %ss", cache_key, settings.cache_ttl_seconds
+            )
+
+        except Exception as e:
+            logger.error("Cache storage error: %s", e)
+
+        # Return response with body
+        new_response = _build_response(
+            accept_encoding,
+            content=content,
+            gzipped=gzipped,
+            status_code=200,
+            headers=headers,
+        )
+        # Add cache header
+        new_response.headers["X-Cache"] = "MISS"
+        await new_response(scope, replay_receive, send)
+
+
+def _replay_receive(chunks: List[bytes], more_body: bool, receive: Receive) -> Receive:
+    """
+    Build a receive channel that replays already-read body chunks first.
+
+    Args:
+        chunks: Body chunks read so far
+        more_body: Whether the client has more body left to send
+        receive: Original ASGI receive channel
+
+    Returns:
+        Receive: Channel yielding the buffered body as one message, then
+            deferring to the client
+    """
+    body_sent = False
+
+    async def replay() -> Message:
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": b"".join(chunks), "more_body": more_body}
+        return await receive()
+
+    return replay
+
+
+def _build_response(
+    accept_encoding: str,
+    content: bytes,
+    gzipped: bool,
+    status_code: int,
+    headers: Dict[str, str],
+) -> Response:
+    """
+    Build a response from cached body bytes, honoring the client's Accept-Encoding.
+
+    Args:
+        accept_encoding: Accept-Encoding header of the request
+        content: Body bytes (gzip-compressed if gzipped is True)
+        gzipped: Whether content is gzip-compressed
+        status_code: Response status code
+        headers: Response headers without encoding-specific headers
+
+    Returns:
+        Response: Response with gzip or identity encoding
+    """
+    # Whether a body is compressed depends on its size, so every cached
+    # response tells shared caches that it varies by Accept-Encoding.
+    # Decompressed bodies are over GZIP_MINIMUM_SIZE, so the outer
+    # GZipMiddleware adds the header to them instead.
+    response_headers = dict(headers)
 
-            except Exception as e:
-                logger.error(f"Cache storage error: {e}")
+    if gzipped and "gzip" not in accept_encoding:
+        content = gzip.decompress(content)
+    else:
+        response_headers["Vary"] = "Accept-Encoding"
+        if gzipped:
+            response_headers["Content-Encoding"] = "gzip"
 
-        return response
+    return Response(content=content, status_code=status_code, headers=response_headers)
 
 
-def _create_cache_key(body: bytes) -> str:
+def _create_cache_key(body_hash: str) -> str:
     """
-    Create cache key from request body.
+    Create cache key from request body hash.
 
     Args:
-        body: Request body bytes
+        body_hash: Hex digest of the request body
 
     Returns:
         str: Cache key
     """
-    # Hash the body content
-    body_hash = hashlib.sha256(body).hexdigest()[:16]
-    return f"cache:moderate:{body_hash}"
\ No newline at end of file
+    return f"cache:moderate:{body_hash}"
@@ -1,90 +1,99 @@
 """Structured request/response logging middleware."""
 
 import logging
-import json
+import orjson
 import time
-from typing import Callable
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.utils.ids import generate_request_id
+from app.utils.timing import get_current_timestamp_iso
 
 logger = logging.getLogger(__name__)
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware for structured request/response logging."""
+class LoggingMiddleware:
+    """Pure ASGI middleware for structured request/response logging."""
 
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
+        self.app = app
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Log request and response metadata.
 
         Args:
-            request: Incoming request
-            call_next: Next middleware in chain
-
-        Returns:
-            Response: Response from next middleware
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
         """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Generate request ID if not present
         request_id = generate_request_id()
-        request.state.request_id = request_id
+        scope.setdefault("state", {})["request_id"] = request_id
+        request_id_header = (b"x-request-id", request_id.encode())
 
         # Start timer
-        start_time = time.perf_counter()
+        start_ns = time.monotonic_ns()
 
         # Get client IP
-        client_ip = request.client.host if request.client else "unknown"
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Add request ID to response headers
+                message["headers"] = [*message.get("headers", []), request_id_header]
+            await send(message)
 
         # Process request
         try:
-            response = await call_next(request)
-            end_time = time.perf_counter()
-            processing_time_ms = int((end_time - start_time) * 1000)
-
-            # Log request/response metadata (structured JSON)
-            log_data = {
-                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime()),
-                "request_id": request_id,
-                "method": request.method,
-                "path": request.url.path,
-                "status_code": response.status_code,
-                "processing_time_ms": processing_time_ms,
-                "user_ip": client_ip,
-            }
+            await self.app(scope, receive, send_wrapper)
 
-            # Log at appropriate level
-            if response.status_code >= 500:
-                logger.error(json.dumps(log_data))
-            elif response.status_code >= 400:
-                logger.warning(json.dumps(log_data))
+            # Pick the level from the status code
+            if status_code >= 500:
+                level = logging.ERROR
+            elif status_code >= 400:
+                level = logging.WARNING
             else:
-                logger.info(json.dumps(log_data))
-
-            # Add request ID to response headers
-            response.headers["X-Request-ID"] = request_id
-
-            return response
+                level = logging.INFO
+
+            # Skip building and serializing the record when the level is filtered out
+            if logger.isEnabledFor(level):
+                processing_time_ms = (time.monotonic_ns() - start_ns) // 1_000_000
+
+                # Log request/response metadata (structured JSON)
+                log_data = {
+                    "timestamp": get_current_timestamp_iso(),
+                    "request_id": request_id,
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status_code": status_code,
+                    "processing_time_ms": processing_time_ms,
+                    "user_ip": client_ip,
+                }
+                logger.log(level, orjson.dumps(log_data).decode())
 
         except Exception as e:
-            end_time = time.perf_counter()
-            processing_time_ms = int((end_time - start_time) * 1000)
+            processing_time_ms = (time.monotonic_ns() - start_ns) // 1_000_000
 
             # Log error
             log_data = {
-                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime()),
+                "timestamp": get_current_timestamp_iso(),
                 "request_id": request_id,
-                "method": request.method,
-                "path": request.url.path,
+                "method": scope["method"],
+                "path": scope["path"],
                 "status_code": 500,
                 "processing_time_ms": processing_time_ms,
                 "user_ip": client_ip,
                 "error": str(e),
             }
-            logger.error(json.dumps(log_data))
+            logger.error(orjson.dumps(log_data).decode())
 
-            raise
\ No newline at end of file
+            raise
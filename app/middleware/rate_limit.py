@@ -1,42 +1,122 @@
 """Redis-based rate limiting middleware."""
 
 import logging
-from typing import Callable
-from fastapi import Request, Response
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+import orjson
+from starlette.types import ASGIApp, Receive, Scope, Send
 import time
+from typing import Optional, Tuple
 
 from app.config.settings import settings
 from app.utils.redis_client import get_redis_client
 
 logger = logging.getLogger(__name__)
 
+# Atomic sliding-window check: trim, count and (if allowed) record in one round-trip.
+# Scores are microsecond timestamps; members come from a per-key INCR sequence,
+# so they are unique without generating random IDs client-side.
+# KEYS[1] = rate limit key, KEYS[2] = member sequence key
+# ARGV = window_start_us, current_us, limit, expire_seconds
+# Returns {count, 0, 0} if allowed, or {count, -1, oldest_us} if the limit was
+# exceeded (oldest_us is the oldest entry's score, 0 if the log is empty).
+SLIDING_WINDOW_LUA = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, ARGV[1])
+local n = redis.call('ZCARD', KEYS[1])
+if n >= tonumber(ARGV[3]) then
+    local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+    local oldest_us = 0
+    if oldest[2] then
+        oldest_us = tonumber(oldest[2])
+    end
+    return {n, -1, oldest_us}
+end
+local member = redis.call('INCR', KEYS[2])
+redis.call('ZADD', KEYS[1], ARGV[2], member)
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('EXPIRE', KEYS[2], ARGV[4])
+return {n, 0, 0}
+"""
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Middleware for Redis-based rate limiting with sliding window."""
+# Atomic two-bucket window counter: the current request is only counted when it
+# is allowed, so rejected retries never inflate the estimate.
+# KEYS[1] = current window key, KEYS[2] = previous window key
+# ARGV = limit, remaining_ms (of the current window), window_ms, expire_seconds
+# Returns {current, previous, 0} if allowed (current includes this request), or
+# {current, previous, -1} if the limit was exceeded (nothing is recorded).
+WINDOW_COUNTER_LUA = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local weighted = current + math.floor(previous * tonumber(ARGV[2]) / tonumber(ARGV[3]))
+if weighted >= tonumber(ARGV[1]) then
+    return {current, previous, -1}
+end
+current = redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return {current, previous, 0}
+"""
+
+# Microseconds per second (sorted set scores are in microseconds)
+_US_PER_SECOND = 1_000_000
+
+# Milliseconds per second (window counter arithmetic stays in integers)
+_MS_PER_SECOND = 1_000
+
+# Fixed 429 body and headers, serialized once
+_BODY_429 = orjson.dumps({"detail": "Rate limit exceeded"})
+_HEADERS_429 = [
+    (b"content-type", b"application/json"),
+    (b"content-length", str(len(_BODY_429)).encode()),
+]
+
+# Scripts registered against the current Redis client (EVALSHA with EVAL fallback),
+# keyed by Lua source
+_scripts = {}
+_script_client = None
+
+
+def _get_script(redis_client, source: str):
+    """
+    Get a Lua script registered on the given Redis client.
+
+    Args:
+        redis_client: Redis client instance
+        source: Lua source of the script
+
+    Returns:
+        Script: Callable script that runs via EVALSHA, loading it on NOSCRIPT
+    """
+    global _script_client
+
+    if _script_client is not redis_client:
+        _scripts.clear()
+        _script_client = redis_client
+    script = _scripts.get(source)
+    if script is None:
+        script = _scripts[source] = redis_client.register_script(source)
+    return script
+
+
+class RateLimitMiddleware:
+    """Pure ASGI middleware for Redis-based sliding-window rate limiting."""
 
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
+        self.app = app
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Check rate limits before processing request.
 
-        Args:
-            request: Incoming request
-            call_next: Next middleware in chain
-
-        Returns:
-            Response: Response from next middleware
+        Requests over the limit are answered with 429 and a Retry-After header
+        without reaching the application.
 
-        Raises:
-            HTTPException: 429 if rate limit exceeded
+        Args:
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
         """
-        # Skip rate limiting if disabled
-        if not settings.rate_limit_enabled:
-            return await call_next(request)
+        # Skip rate limiting for non-HTTP traffic or if disabled
+        if scope["type"] != "http" or not settings.rate_limit_enabled:
+            await self.app(scope, receive, send)
+            return
 
         # Get Redis client
         redis_client = get_redis_client()
@@ -44,64 +124,183 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         # If Redis is unavailable, skip rate limiting (graceful degradation)
         if redis_client is None:
             logger.warning("Redis unavailable, skipping rate limit check")
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
         # Get client IP
-        client_ip = request.client.host if request.client else "unknown"
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
 
         # Create rate limit key
-        endpoint = request.url.path
+        endpoint = scope["path"]
         rate_limit_key = f"rate_limit:{client_ip}:{endpoint}"
 
-        try:
-            # Get current timestamp
-            current_time = int(time.time())
-            window_start = current_time - settings.rate_limit_window_seconds
-
-            # Remove old entries outside the window
-            redis_client.zremrangebyscore(rate_limit_key, 0, window_start)
+        # Set when the request is over the limit
+        retry_after = None
 
-            # Count requests in current window
-            request_count = redis_client.zcard(rate_limit_key)
+        try:
+            if settings.rate_limit_strategy == "sliding_log":
+                request_count, retry_after = await _check_sliding_log(
+                    redis_client, rate_limit_key
+                )
+            else:
+                request_count, retry_after = await _check_window_counter(
+                    redis_client, rate_limit_key
+                )
 
             # Debug logging
-            logger.debug(f"[RATE LIMIT CHECK] IP: {client_ip}, Count: {request_count}/{settings.rate_limit_requests}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "[RATE LIMIT CHECK] IP: %s, Count: %d/%d",
+                    client_ip,
+                    request_count,
+                    settings.rate_limit_requests,
+                )
 
             # Check if limit exceeded
-            if request_count >= settings.rate_limit_requests:
-                # Calculate retry after
-                oldest_request = redis_client.zrange(rate_limit_key, 0, 0, withscores=True)
-                if oldest_request:
-                    oldest_time = int(oldest_request[0][1])
-                    retry_after = (
-                        oldest_time + settings.rate_limit_window_seconds - current_time
-                    )
-                else:
-                    retry_after = settings.rate_limit_window_seconds
-
+            if retry_after is not None:
                 logger.warning(
-                    f"[RATE LIMIT] Exceeded for {client_ip} on {endpoint}. "
-                    f"Count: {request_count}/{settings.rate_limit_requests}"
-                )
-
-                # Return 429 response directly
-                return JSONResponse(
-                    status_code=429,
-                    content={"detail": "Rate limit exceeded"},
-                    headers={"Retry-After": str(max(1, retry_after))},
+                    "[RATE LIMIT] Exceeded for %s on %s. Count: %d/%d",
+                    client_ip,
+                    endpoint,
+                    request_count,
+                    settings.rate_limit_requests,
                 )
 
-            # Add current request to window (use unique ID with timestamp)
-            import uuid
-            unique_id = f"{current_time}_{uuid.uuid4().hex[:8]}"
-            redis_client.zadd(rate_limit_key, {unique_id: current_time})
-
-            # Set expiry on key (cleanup)
-            redis_client.expire(rate_limit_key, settings.rate_limit_window_seconds + 10)
-
         except Exception as e:
             # If rate limiting fails, log and continue (graceful degradation)
             logger.error(f"Rate limiting error: {e}")
 
+        # Send 429 response directly
+        if retry_after is not None:
+            await _send_rate_limited(send, max(1, retry_after))
+            return
+
         # Process request
-        return await call_next(request)
\ No newline at end of file
+        await self.app(scope, receive, send)
+
+
+async def _check_window_counter(redis_client, rate_limit_key: str) -> Tuple[int, Optional[int]]:
+    """
+    Check the limit with a two-bucket sliding-window counter.
+
+    The previous window's count is weighted by how much of it still overlaps
+    the sliding window. The check and increment run in one Lua script, and
+    only allowed requests are counted, so a client retrying while limited
+    regains capacity as the window slides. Stores two integers per client
+    and endpoint.
+
+    Args:
+        redis_client: Redis client instance
+        rate_limit_key: Rate limit key prefix for the client and endpoint
+
+    Returns:
+        Tuple[int, Optional[int]]: (estimated request count, retry-after seconds
+            or None if the request is allowed)
+    """
+    window = settings.rate_limit_window_seconds
+    limit = settings.rate_limit_requests
+    window_ms = window * _MS_PER_SECOND
+    window_index, elapsed_ms = divmod(time.time_ns() // 1_000_000, window_ms)
+    remaining_ms = window_ms - elapsed_ms
+
+    script = _get_script(redis_client, WINDOW_COUNTER_LUA)
+    current_count, previous_count, status = await script(
+        keys=[f"{rate_limit_key}:{window_index}", f"{rate_limit_key}:{window_index - 1}"],
+        args=[limit, remaining_ms, window_ms, 2 * window],
+    )
+
+    weighted_count = current_count + previous_count * remaining_ms // window_ms
+    if status != -1:
+        return weighted_count, None
+
+    # Count includes the rejected request
+    return weighted_count + 1, _window_counter_retry_after(
+        current_count, previous_count, limit, remaining_ms, window_ms
+    )
+
+
+def _window_counter_retry_after(
+    current_count: int, previous_count: int, limit: int, remaining_ms: int, window_ms: int
+) -> int:
+    """
+    Compute how long until the weighted count leaves room for one more request.
+
+    A request is allowed once current + previous * remaining / window < limit.
+
+    Args:
+        current_count: Requests recorded in the current window
+        previous_count: Requests recorded in the previous window
+        limit: Maximum requests per window
+        remaining_ms: Time left in the current window
+        window_ms: Window length
+
+    Returns:
+        int: Seconds to wait
+    """
+    if current_count < limit:
+        # The previous window's share has to decay within the current window
+        wait_ms = remaining_ms - (limit - current_count) * window_ms // previous_count
+    else:
+        # The current window is full: wait for it to become the previous window
+        # and for its weighted share to drop below the limit
+        wait_ms = remaining_ms + (current_count - limit) * window_ms // max(current_count, 1)
+    return wait_ms // _MS_PER_SECOND + 1
+
+
+async def _check_sliding_log(redis_client, rate_limit_key: str) -> Tuple[int, Optional[int]]:
+    """
+    Check the limit with an exact sliding log stored in a sorted set.
+
+    Args:
+        redis_client: Redis client instance
+        rate_limit_key: Rate limit key for the client and endpoint
+
+    Returns:
+        Tuple[int, Optional[int]]: (request count, retry-after seconds or None
+            if the request is allowed)
+    """
+    window = settings.rate_limit_window_seconds
+
+    # Get current timestamp in microseconds
+    window_us = window * _US_PER_SECOND
+    current_us = time.time_ns() // 1000
+    window_start_us = current_us - window_us
+
+    # Trim, count, record and (if rejected) find the oldest entry in one round-trip
+    script = _get_script(redis_client, SLIDING_WINDOW_LUA)
+    request_count, status, oldest_us = await script(
+        keys=[rate_limit_key, f"{rate_limit_key}:seq"],
+        args=[
+            window_start_us,
+            current_us,
+            settings.rate_limit_requests,
+            window + 10,
+        ],
+    )
+
+    if status != -1:
+        return request_count, None
+
+    # Retry once the oldest entry leaves the window
+    if not oldest_us:
+        return request_count, window
+    return request_count, -((current_us - oldest_us - window_us) // _US_PER_SECOND)
+
+
+async def _send_rate_limited(send: Send, retry_after: int) -> None:
+    """
+    Send a 429 response as raw ASGI messages.
+
+    Args:
+        send: ASGI send channel
+        retry_after: Seconds until the client may retry
+    """
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [*_HEADERS_429, (b"retry-after", str(retry_after).encode())],
+        }
+    )
+    await send({"type": "http.response.body", "body": _BODY_429})
\ No newline at end of file
@@ -1,7 +1,10 @@
 """Request schemas for the moderation API."""
 
-from typing import List, Optional, Dict
-from pydantic import BaseModel, Field, field_validator
+from typing import Annotated, List, Optional, Dict
+from pydantic import BaseModel, Field
+
+# Threshold bounds are enforced by pydantic-core during parsing
+Threshold = Annotated[float, Field(ge=0.0, le=1.0)]
 
 
 class ModerationInput(BaseModel):
@@ -22,7 +25,7 @@ class ModerationRequest(BaseModel):
         None,
         description="Model identifier; defaults to config value if not provided",
     )
-    thresholds: Optional[Dict[str, float]] = Field(
+    thresholds: Optional[Dict[str, Threshold]] = Field(
         None,
         description="Per-category threshold overrides (0.0-1.0)",
     )
@@ -31,16 +34,6 @@ class ModerationRequest(BaseModel):
         description="Include raw probability scores in response",
     )
 
-    @field_validator("thresholds")
-    @classmethod
-    def validate_thresholds(cls, v: Optional[Dict[str, float]]) -> Optional[Dict[str, float]]:
-        """Validate threshold values are between 0.0 and 1.0."""
-        if v is not None:
-            for category, threshold in v.items():
-                if not 0.0 <= threshold <= 1.0:
-                    raise ValueError(f"Threshold for {category} must be between 0.0 and 1.0")
-        return v
-
     class Config:
         json_schema_extra = {
             "example": {
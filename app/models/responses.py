@@ -110,6 +110,9 @@ class ComponentStatus(BaseModel):
     latency_ms: Optional[int] = Field(None, description="Component latency in milliseconds")
     name: Optional[str] = Field(None, description="Component name")
     load_time_seconds: Optional[float] = Field(None, description="Load time in seconds")
+    hits: Optional[int] = Field(None, description="Cache hits since startup")
+    misses: Optional[int] = Field(None, description="Cache misses since startup")
+    hit_rate: Optional[float] = Field(None, description="Fraction of lookups served from cache")
 
     model_config = {"exclude_none": True}
 
@@ -137,6 +140,12 @@ class HealthResponse(BaseModel):
                         "name": "unitary/toxic-bert",
                         "load_time_seconds": 12.5,
                     },
+                    "cache": {
+                        "status": "enabled",
+                        "hits": 750,
+                        "misses": 250,
+                        "hit_rate": 0.75,
+                    },
                 },
                 "version": "1.0.0",
             }
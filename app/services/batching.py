@@ -0,0 +1,110 @@
+"""Micro-batching of inference calls across concurrent requests."""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Runs one batch: (texts, model_name) -> one result per text
+BatchFn = Callable[[List[str], Optional[str]], Awaitable[List[Any]]]
+
+
+class BatchRunner:
+    """
+    Coalesce texts submitted by concurrent callers into shared model calls.
+
+    Texts are queued until either max_batch_size texts are pending or
+    max_wait_ms has passed since the first one arrived, then all pending texts
+    are run as one batch (one call per model name) and each caller receives
+    its own results.
+    """
+
+    def __init__(self, run_batch: BatchFn, max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        """
+        Initialize the batch runner.
+
+        Args:
+            run_batch: Coroutine function that scores a list of texts
+            max_batch_size: Maximum number of texts per batch
+            max_wait_ms: Maximum time to wait for more texts before running
+        """
+        self._run_batch = run_batch
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait_ms / 1000
+        self._pending: List[tuple] = []
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, texts: List[str], model_name: Optional[str] = None) -> List[Any]:
+        """
+        Score texts as part of the next shared batch.
+
+        Args:
+            texts: Texts to score
+            model_name: Model identifier (optional)
+
+        Returns:
+            List[Any]: One result per text, in input order
+        """
+        loop = asyncio.get_running_loop()
+        futures = []
+
+        for text in texts:
+            future = loop.create_future()
+            self._pending.append((text, model_name, future))
+            futures.append(future)
+            if len(self._pending) >= self._max_batch_size:
+                self._flush(loop)
+
+        # First pending text starts the wait window
+        if self._pending and self._flush_timer is None:
+            self._flush_timer = loop.call_later(self._max_wait, self._flush, loop)
+
+        return list(await asyncio.gather(*futures))
+
+    def _flush(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Start running all pending texts as one batch.
+
+        Args:
+            loop: Event loop the pending futures belong to
+        """
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+        items, self._pending = self._pending, []
+        if not items:
+            return
+
+        task = loop.create_task(self._run(items))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, items: List[tuple]) -> None:
+        """
+        Run a batch and deliver results to the waiting callers.
+
+        Args:
+            items: Pending (text, model_name, future) entries
+        """
+        # Group by model; callers that went away are skipped
+        groups: Dict[Optional[str], List[tuple]] = {}
+        for text, model_name, future in items:
+            if not future.done():
+                groups.setdefault(model_name, []).append((text, future))
+
+        for model_name, group in groups.items():
+            try:
+                results = await self._run_batch([text for text, _ in group], model_name)
+            except Exception as e:
+                logger.error("Batched inference error: %s", e)
+                for _, future in group:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(group, results):
+                if not future.done():
+                    future.set_result(result)
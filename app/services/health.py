@@ -1,19 +1,31 @@
 """Health check service."""
 
+import asyncio
 import logging
 import time
-from typing import Dict
+from typing import Any, Dict, Optional
 
 from app.config.settings import settings
 from app.utils.redis_client import check_redis_health
-from app.services.moderation import is_model_loaded, get_loaded_model_name, get_model_load_time
-from app.models.responses import ComponentStatus
+from app.services.moderation import (
+    get_loaded_model_name,
+    get_model_load_time,
+    get_score_cache_stats,
+    is_model_loaded,
+)
 
 logger = logging.getLogger(__name__)
 
 # Track application start time
 _start_time = time.time()
 
+# Health results are reused for this long so frequent probes share one Redis PING
+HEALTH_CACHE_TTL_SECONDS = 0.5
+
+# Last health result as (monotonic_time, (overall_status, component_statuses))
+_health_cache: Optional[tuple[float, tuple[str, Dict[str, Dict[str, Any]]]]] = None
+_health_lock = asyncio.Lock()
+
 
 def get_uptime_seconds() -> float:
     """
@@ -25,7 +37,50 @@ def get_uptime_seconds() -> float:
     return time.time() - _start_time
 
 
-async def check_health() -> tuple[str, Dict[str, ComponentStatus]]:
+def _component(status: str, **fields: Any) -> Dict[str, Any]:
+    """
+    Build a component status, leaving out fields that are not set.
+
+    Args:
+        status: Component status
+        **fields: Optional ComponentStatus fields
+
+    Returns:
+        Dict[str, Any]: Component status (ComponentStatus schema)
+    """
+    component = {"status": status}
+    component.update((name, value) for name, value in fields.items() if value is not None)
+    return component
+
+
+async def check_health() -> tuple[str, Dict[str, Dict[str, Any]]]:
+    """
+    Check health of all components, reusing a result younger than the cache TTL.
+
+    Concurrent callers that miss the cache wait on one lock, so only one of
+    them runs the checks.
+
+    Returns:
+        tuple: (overall_status, component_statuses)
+    """
+    global _health_cache
+
+    cached = _health_cache
+    if cached is not None and time.monotonic() - cached[0] < HEALTH_CACHE_TTL_SECONDS:
+        return cached[1]
+
+    async with _health_lock:
+        # Another caller may have refreshed the result while we waited
+        cached = _health_cache
+        if cached is not None and time.monotonic() - cached[0] < HEALTH_CACHE_TTL_SECONDS:
+            return cached[1]
+
+        result = await _check_components()
+        _health_cache = (time.monotonic(), result)
+        return result
+
+
+async def _check_components() -> tuple[str, Dict[str, Dict[str, Any]]]:
     """
     Check health of all components.
 
@@ -34,31 +89,45 @@ async def check_health() -> tuple[str, Dict[str, ComponentStatus]]:
             - overall_status: "healthy" or "degraded"
             - component_statuses: Dict of component statuses
     """
+    # Plain dicts (ComponentStatus schema) serialized directly by the endpoint
     components = {}
 
     # Check API (always operational if we get here)
-    components["api"] = ComponentStatus(status="operational")
+    components["api"] = _component(status="operational")
 
     # Check Redis
     redis_healthy, redis_latency = await check_redis_health()
     if redis_healthy:
-        components["redis"] = ComponentStatus(
+        components["redis"] = _component(
             status="operational", latency_ms=redis_latency
         )
     else:
-        components["redis"] = ComponentStatus(status="unavailable")
+        components["redis"] = _component(status="unavailable")
 
     # Check Model
     if is_model_loaded():
         model_name = get_loaded_model_name()
         load_time = get_model_load_time()
-        components["model"] = ComponentStatus(
+        components["model"] = _component(
             status="loaded",
             name=model_name,
             load_time_seconds=round(load_time, 2) if load_time else None,
         )
     else:
-        components["model"] = ComponentStatus(status="not_loaded")
+        components["model"] = _component(status="not_loaded")
+
+    # Report score cache effectiveness
+    if settings.cache_enabled:
+        hits, misses = get_score_cache_stats()
+        lookups = hits + misses
+        components["cache"] = _component(
+            status="enabled",
+            hits=hits,
+            misses=misses,
+            hit_rate=round(hits / lookups, 4) if lookups else None,
+        )
+    else:
+        components["cache"] = _component(status="disabled")
 
     # Determine overall status
     overall_status = "healthy"
@@ -0,0 +1,194 @@
+"""Model inference in dedicated worker processes.
+
+Enabled with ``INFERENCE_WORKERS`` > 0. Each worker loads the model once and
+scores batches, so forward passes and tokenization never hold the serving
+process's GIL.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.config.settings import settings
+from app.utils.lru import LRUCache
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+# Model the workers reported after their first successful call, as
+# (model_name, load_time_seconds); read by the serving process for health checks
+_pool_model: Optional[Tuple[str, float]] = None
+
+# Models each worker keeps loaded, so requests alternating between a few
+# models do not reload them from disk every time
+MAX_WORKER_MODELS = 2
+
+# Per-worker-process models: model_name -> (model, tokenizer, tokenize, device, load_time)
+_worker_models = LRUCache(MAX_WORKER_MODELS)
+
+
+def _ensure_worker_model(model_name: str) -> tuple:
+    """
+    Load the model in this worker process unless it is already loaded.
+
+    Args:
+        model_name: Model identifier
+
+    Returns:
+        tuple: (model, tokenizer, tokenize, device, load_time)
+    """
+    loaded = _worker_models.get(model_name)
+    if loaded is None:
+        from app.services.moderation import _bind_tokenizer, _load_model_sync
+
+        start = time.perf_counter()
+        model, tokenizer, device = _load_model_sync(model_name)
+        load_time = time.perf_counter() - start
+        loaded = (model, tokenizer, _bind_tokenizer(tokenizer), device, load_time)
+        _worker_models.set(model_name, loaded)
+
+    return loaded
+
+
+def _init_worker(model_name: str) -> None:
+    """
+    Preload the default model when a worker process starts.
+
+    Args:
+        model_name: Model identifier
+    """
+    _ensure_worker_model(model_name)
+
+
+def _worker_predict(
+    texts: List[str], model_name: Optional[str]
+) -> Tuple[np.ndarray, str, float]:
+    """
+    Score a batch of texts inside a worker process.
+
+    Args:
+        texts: Texts to score
+        model_name: Model identifier (optional)
+
+    Returns:
+        tuple: (scores with shape (n_texts, n_categories), model name,
+            model load time in seconds)
+    """
+    from app.services.moderation import _predict_sync
+
+    name = model_name or settings.default_model
+    model, tokenizer, tokenize, device, load_time = _ensure_worker_model(name)
+    return _predict_sync(model, tokenizer, tokenize, device, texts), name, load_time
+
+
+def get_inference_pool() -> ProcessPoolExecutor:
+    """
+    Get the worker pool, starting it on first use.
+
+    Workers are spawned rather than forked so they do not inherit the event
+    loop, Redis connections or torch thread pools of the serving process.
+
+    Returns:
+        ProcessPoolExecutor: Pool of settings.inference_workers processes
+    """
+    global _pool
+
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.inference_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(settings.default_model,),
+        )
+        logger.info(f"[MODEL] Started {settings.inference_workers} inference worker(s)")
+
+    return _pool
+
+
+async def run_in_inference_pool(
+    texts: List[str], model_name: Optional[str] = None
+) -> np.ndarray:
+    """
+    Score a batch of texts in a worker process.
+
+    Args:
+        texts: Texts to score
+        model_name: Model identifier (optional)
+
+    Returns:
+        np.ndarray: Category scores (0.0-1.0) with shape (n_texts, n_categories)
+    """
+    global _pool_model
+
+    loop = asyncio.get_running_loop()
+    pool = get_inference_pool()
+    try:
+        scores, loaded_name, load_time = await loop.run_in_executor(
+            pool, _worker_predict, texts, model_name
+        )
+    except BrokenProcessPool:
+        # A worker died (e.g. the initializer failed to load the model); start a
+        # fresh pool on the next call instead of failing every call from now on
+        _discard_broken_pool(pool)
+        raise
+
+    # The serving process never loads the model itself, so record what the workers loaded
+    if _pool_model is None or _pool_model[0] != loaded_name:
+        _pool_model = (loaded_name, load_time)
+    return scores
+
+
+def _discard_broken_pool(pool: ProcessPoolExecutor) -> None:
+    """
+    Drop a broken worker pool so the next call starts a new one.
+
+    Args:
+        pool: Pool that raised BrokenProcessPool
+    """
+    global _pool, _pool_model
+
+    if _pool is pool:
+        _pool = None
+        _pool_model = None
+        logger.error("[MODEL] Inference worker pool broke; restarting it on next use")
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def get_pool_model() -> Optional[Tuple[str, float]]:
+    """
+    Get the model loaded by the workers, once one has served a call.
+
+    Returns:
+        Optional[Tuple[str, float]]: (model_name, load_time_seconds), or None
+    """
+    return _pool_model
+
+
+async def warm_up_inference_pool() -> None:
+    """
+    Start the workers and run one warm-up batch per worker.
+
+    Every worker loads the default model in its initializer; the batches are
+    spread over the pool but not guaranteed to reach each worker once.
+    """
+    await asyncio.gather(
+        *(run_in_inference_pool(["warm-up"]) for _ in range(settings.inference_workers))
+    )
+
+
+def shutdown_inference_pool() -> None:
+    """Stop the worker processes, if started."""
+    global _pool, _pool_model
+
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
+        _pool_model = None
+        logger.info("[MODEL] Inference workers stopped")
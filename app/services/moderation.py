@@ -1,26 +1,228 @@
 """Moderation service with model loading, inference, and threshold logic."""
 
 import asyncio
+import functools
 import logging
-from typing import Dict, Optional, Any
-import threading
+import os
+import queue
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+import numpy as np
 
 from app.config.settings import settings
-from app.config.categories import CATEGORIES, DEFAULT_THRESHOLDS
+from app.config.categories import CATEGORIES, CATEGORY_INDEX, DEFAULT_THRESHOLDS
+from app.utils.redis_client import get_redis_client
+from app.utils.hashing import content_digest
+from app.utils.lru import LRUCache
+from app.services.batching import BatchRunner
 
 logger = logging.getLogger(__name__)
 
-# Global model instance and lock for thread-safe loading
-_model = None
-_tokenizer = None
-_model_lock = threading.Lock()
-_model_load_time: Optional[float] = None
-_model_name: Optional[str] = None
+# Let the Rust tokenizer encode each micro-batch across threads (explicit settings win)
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "true")
+
+
+class _LoadedModel(NamedTuple):
+    """Everything inference needs from one model load."""
+
+    model: Any
+    tokenizer: Any
+    name: str
+    # Resolved once per load so inference does not re-derive them per call
+    device: Any
+    tokenize: Any
+    load_time: float
+
+
+# Current model, published with a single assignment so readers never see a
+# half-updated state; the lock makes concurrent requests load it only once
+_loaded: Optional[_LoadedModel] = None
+_model_lock = asyncio.Lock()
+
+# Longest tokenized input; traced models always run at this length
+_MAX_SEQUENCE_LENGTH = 512
+
+# Free CUDA input buffer slots, each mapping tokenizer output name to a
+# (pinned host, device) buffer pair. Every in-flight batch takes its own slot,
+# so concurrent batches neither share input tensors nor wait on each other.
+_device_buffer_slots: "queue.SimpleQueue[Dict[str, Any]]" = queue.SimpleQueue()
+
+# Default threshold vector in CATEGORIES order, built once (read-only; copy before changing)
+_DEFAULT_THRESHOLD_VECTOR = np.array(
+    [
+        settings.default_thresholds.get(category, DEFAULT_THRESHOLDS.get(category, 0.5))
+        for category in CATEGORIES
+    ],
+    dtype=np.float64,
+)
+_DEFAULT_THRESHOLD_VECTOR.setflags(write=False)
+
+
+def _intra_op_thread_count() -> int:
+    """
+    Get the number of intra-op threads each inference process should use.
+
+    Returns:
+        int: TORCH_INTRA_OP_THREADS if set, otherwise an even share of half
+            the logical cores per inference worker process
+    """
+    # Physical cores are shared between inference worker processes
+    workers = max(1, settings.inference_workers)
+    return settings.torch_intra_op_threads or max(1, (os.cpu_count() or 2) // 2 // workers)
+
+
+def _configure_cpu_threads() -> None:
+    """
+    Size PyTorch's CPU thread pools for serving.
+
+    The defaults use every logical core for intra-op work plus a separate
+    inter-op pool, which oversubscribes the CPU once several requests run in
+    the worker threadpool. The OpenMP/MKL variables only take effect if set
+    before torch is first imported.
+    """
+    intra_op_threads = _intra_op_thread_count()
+
+    os.environ.setdefault("OMP_NUM_THREADS", str(intra_op_threads))
+    os.environ.setdefault("KMP_BLOCKTIME", "0")
+    os.environ.setdefault("KMP_AFFINITY", "granularity=fine,compact,1,0")
+
+    import torch
+
+    torch.set_num_threads(intra_op_threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Can only be set once, before any inter-op parallel work has started
+        pass
+
+
+def _trace_model(model, tokenizer, device):
+    """
+    Compile the model into an optimized TorchScript graph.
+
+    Tracing removes per-layer Python dispatch, and optimize_for_inference
+    freezes the graph and fuses ops. The trace is specialized to the
+    sequence length, so inputs must be padded to _MAX_SEQUENCE_LENGTH.
+
+    Args:
+        model: Eager model in evaluation mode
+        tokenizer: Tokenizer matching the model
+        device: Device the model runs on
+
+    Returns:
+        torch.jit.ScriptModule: Traced model taking (input_ids, attention_mask)
+    """
+    import torch
+
+    example = tokenizer(
+        ["warm-up"],
+        return_tensors="pt",
+        truncation=True,
+        max_length=_MAX_SEQUENCE_LENGTH,
+        padding="max_length",
+    )
+    example_inputs = (example["input_ids"].to(device), example["attention_mask"].to(device))
+
+    with torch.no_grad():
+        traced = torch.jit.trace(model, example_inputs, strict=False)
+
+    return torch.jit.optimize_for_inference(traced)
+
+
+def _gpu_dtype():
+    """
+    Get the dtype the model runs in on GPU.
+
+    Returns:
+        torch.dtype: float32, or bf16/fp16 when MODEL_HALF_PRECISION_GPU is set
+    """
+    import torch
+
+    if not settings.model_half_precision_gpu:
+        return torch.float32
+    return torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+
+
+def _load_model_sync(model_name: str) -> tuple:
+    """
+    Load a model and its tokenizer for the configured backend.
+
+    This is blocking; it runs in a worker thread, or directly in an inference
+    worker process.
+
+    Args:
+        model_name: Model identifier
+
+    Returns:
+        tuple: (model, tokenizer, device); device is None for the ONNX backend
+    """
+    if settings.model_backend == "onnx":
+        from app.services.onnx_model import load_onnx_model
+
+        session, tokenizer = load_onnx_model(model_name)
+        return session, tokenizer, None
+
+    _configure_cpu_threads()
+
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+    import torch
+
+    tokenizer = AutoTokenizer.from_pretrained(
+        model_name, cache_dir=settings.model_cache_dir, use_fast=True
+    )
+    model = AutoModelForSequenceClassification.from_pretrained(
+        model_name, cache_dir=settings.model_cache_dir
+    )
+    model.eval()  # Set to evaluation mode
+
+    # Move to GPU if available, in half precision (bf16 where supported) only when enabled
+    if torch.cuda.is_available():
+        dtype = _gpu_dtype()
+        model = model.to(device="cuda", dtype=dtype)
+        logger.info(f"Model loaded on GPU ({dtype})")
+    elif settings.model_quantize_cpu:
+        # INT8 weights for Linear layers (FBGEMM/VNNI kernels on x86)
+        if "fbgemm" in torch.backends.quantized.supported_engines:
+            torch.backends.quantized.engine = "fbgemm"
+        model = torch.ao.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        logger.info("Model loaded on CPU (dynamic INT8)")
+    else:
+        logger.info("Model loaded on CPU")
+
+    # Dynamically quantized models have no float parameters and always run on CPU
+    param = next(model.parameters(), None)
+    device = param.device if param is not None else torch.device("cpu")
+
+    if settings.model_jit_trace:
+        model = _trace_model(model, tokenizer, device)
+        logger.info("Model traced with TorchScript")
+
+    return model, tokenizer, device
+
+
+def _bind_tokenizer(tokenizer):
+    """
+    Pre-bind the tokenizer arguments used for every inference batch.
+
+    Args:
+        tokenizer: Loaded tokenizer
+
+    Returns:
+        functools.partial: Callable taking a list of texts
+    """
+    return functools.partial(
+        tokenizer,
+        return_tensors="pt",
+        truncation=True,
+        max_length=_MAX_SEQUENCE_LENGTH,
+        padding="max_length" if settings.model_jit_trace else True,
+    )
 
 
 async def load_model(model_name: Optional[str] = None) -> tuple:
     """
-    Load the moderation model (lazy loading with thread safety).
+    Load the moderation model (lazy loading; concurrent callers share one load).
 
     Args:
         model_name: Model identifier (defaults to settings.default_model)
@@ -28,155 +230,519 @@ async def load_model(model_name: Optional[str] = None) -> tuple:
     Returns:
         tuple: (model, tokenizer)
     """
-    global _model, _tokenizer, _model_load_time, _model_name
+    loaded = await _get_loaded_model(model_name)
+    return loaded.model, loaded.tokenizer
+
+
+async def _get_loaded_model(model_name: Optional[str] = None) -> _LoadedModel:
+    """
+    Get the loaded model, loading it first if needed.
+
+    Args:
+        model_name: Model identifier (defaults to settings.default_model)
+
+    Returns:
+        _LoadedModel: Model, tokenizer and per-load inference state
+    """
+    global _loaded
 
     # Use default model if not specified
     if model_name is None:
         model_name = settings.default_model
 
-    # Check if model is already loaded
-    if _model is not None and _tokenizer is not None and _model_name == model_name:
-        return _model, _tokenizer
+    # Hot path: one global read
+    loaded = _loaded
+    if loaded is not None and loaded.name == model_name:
+        return loaded
 
-    # Acquire lock for thread-safe loading
-    with _model_lock:
+    # Acquire lock without blocking the event loop while another caller loads
+    async with _model_lock:
         # Double-check after acquiring lock
-        if _model is not None and _tokenizer is not None and _model_name == model_name:
-            return _model, _tokenizer
+        loaded = _loaded
+        if loaded is not None and loaded.name == model_name:
+            return loaded
 
         logger.info(f"[MODEL] Loading: {model_name}")
         import time
 
         start = time.perf_counter()
 
-        # Load model in a separate thread to avoid blocking
-        def _load():
-            from transformers import AutoTokenizer, AutoModelForSequenceClassification
-            import torch
+        # Run in thread pool to avoid blocking event loop
+        model, tokenizer, device = await asyncio.to_thread(_load_model_sync, model_name)
 
-            tokenizer = AutoTokenizer.from_pretrained(
-                model_name, cache_dir=settings.model_cache_dir
-            )
-            model = AutoModelForSequenceClassification.from_pretrained(
-                model_name, cache_dir=settings.model_cache_dir
-            )
-            model.eval()  # Set to evaluation mode
+        end = time.perf_counter()
+        loaded = _LoadedModel(
+            model=model,
+            tokenizer=tokenizer,
+            name=model_name,
+            device=device,
+            tokenize=_bind_tokenizer(tokenizer),
+            load_time=end - start,
+        )
+        _loaded = loaded
 
-            # Move to CPU (for simplicity; can be modified for GPU)
-            if torch.cuda.is_available():
-                model = model.cuda()
-                logger.info("Model loaded on GPU")
-            else:
-                logger.info("Model loaded on CPU")
+        logger.info(f"[MODEL] Loaded successfully in {loaded.load_time:.2f}s")
 
-            return model, tokenizer
+    return loaded
 
-        # Run in thread pool to avoid blocking event loop
-        _model, _tokenizer = await asyncio.to_thread(_load)
-        _model_name = model_name
 
-        end = time.perf_counter()
-        _model_load_time = end - start
+async def warm_up_model() -> None:
+    """
+    Load the default model and run one forward pass.
 
-        logger.info(f"[MODEL] Loaded successfully in {_model_load_time:.2f}s")
+    Called at startup so the first request does not pay for model loading or
+    first-call kernel initialization.
+    """
+    if settings.inference_workers > 0:
+        from app.services.inference_pool import warm_up_inference_pool
 
-    return _model, _tokenizer
+        await warm_up_inference_pool()
+        logger.info("[MODEL] Warm-up complete")
+        return
+
+    await load_model()
+    await run_inference_batch(["warm-up"])
+    logger.info("[MODEL] Warm-up complete")
+
+
+def _loaded_model_info() -> Optional[Tuple[str, float]]:
+    """
+    Get the loaded model's name and load time, wherever it was loaded.
+
+    With INFERENCE_WORKERS > 0 the model lives in the worker processes, so the
+    workers' report is used instead of this process's state.
+
+    Returns:
+        Optional[Tuple[str, float]]: (model_name, load_time_seconds), or None
+    """
+    if settings.inference_workers > 0:
+        from app.services.inference_pool import get_pool_model
+
+        return get_pool_model()
+
+    loaded = _loaded
+    return (loaded.name, loaded.load_time) if loaded is not None else None
 
 
 def get_model_load_time() -> Optional[float]:
     """Get the time taken to load the model."""
-    return _model_load_time
+    info = _loaded_model_info()
+    return info[1] if info is not None else None
 
 
 def is_model_loaded() -> bool:
     """Check if model is loaded."""
-    return _model is not None and _tokenizer is not None
+    return _loaded_model_info() is not None
 
 
 def get_loaded_model_name() -> Optional[str]:
     """Get the name of the loaded model."""
-    return _model_name
+    info = _loaded_model_info()
+    return info[0] if info is not None else None
+
+
+def _map_to_categories(probabilities: np.ndarray) -> np.ndarray:
+    """
+    Map toxic-bert label probabilities to moderation category scores.
+
+    Args:
+        probabilities: Sigmoid probabilities with shape (n_inputs, n_labels),
+            columns in toxic-bert label order
+
+    Returns:
+        np.ndarray: Category scores (0.0-1.0) with shape (n_inputs, n_categories),
+            columns in CATEGORIES order
+    """
+    # Map toxic-bert labels to OpenAI moderation categories
+    # toxic-bert outputs: [toxic, severe_toxic, obscene, threat, insult, identity_hate]
+    # Our categories: [harassment, hate, profanity, sexual, spam, violence]
+
+    # Mapping logic based on label semantics:
+    # - toxic/severe_toxic/insult → harassment (aggressive behavior)
+    # - identity_hate → hate (targeted discrimination)
+    # - obscene → profanity (inappropriate language)
+    # - threat → violence (threatening behavior)
+    # Note: toxic-bert doesn't have sexual/spam, so we derive them from other signals
+
+    # Missing labels score 0.0
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    labels = np.zeros((probabilities.shape[0], 6), dtype=np.float64)
+    labels[:, : probabilities.shape[1]] = probabilities[:, :6]
+    toxic, severe_toxic, obscene, threat, insult, identity_hate = labels.T
+
+    scores = np.empty((labels.shape[0], len(CATEGORIES)), dtype=np.float64)
+
+    # Harassment: combination of toxic, insult, and severe_toxic
+    scores[:, CATEGORY_INDEX["harassment"]] = np.maximum(insult, (toxic + severe_toxic) / 2)
+
+    # Hate: primarily identity_hate, boosted by severe_toxic
+    scores[:, CATEGORY_INDEX["hate"]] = np.maximum(identity_hate, severe_toxic * 0.8)
+
+    # Profanity: obscene language
+    scores[:, CATEGORY_INDEX["profanity"]] = obscene
 
+    # Sexual: derive from obscene when combined with low threat/insult
+    # (obscene language that's not threatening/insulting is often sexual)
+    scores[:, CATEGORY_INDEX["sexual"]] = np.where(
+        (threat < 0.5) & (insult < 0.5), obscene * 0.6, obscene * 0.3
+    )
 
-async def run_inference(text: str, model_name: Optional[str] = None) -> Dict[str, float]:
+    # Violence: threat-based content
+    scores[:, CATEGORY_INDEX["violence"]] = threat
+
+    # Spam: derive from toxic patterns with low semantic content
+    # (repetitive toxic content with low specific category scores)
+    scores[:, CATEGORY_INDEX["spam"]] = np.where(
+        (insult < 0.4) & (threat < 0.4) & (obscene < 0.4), toxic * 0.3, 0.0
+    )
+
+    return scores
+
+
+def _predict_sync(model, tokenizer, tokenize, device, texts: List[str]) -> np.ndarray:
     """
-    Run inference on text input.
+    Score a batch of texts in a single forward pass.
+
+    This is blocking; it runs in a worker thread or an inference worker process.
 
     Args:
-        text: Text to moderate
+        model: Loaded model (ONNX session for the ONNX backend)
+        tokenizer: Tokenizer matching the model
+        tokenize: Tokenizer with the batch arguments bound (see _bind_tokenizer)
+        device: Device the model runs on
+        texts: Texts to score
+
+    Returns:
+        np.ndarray: Category scores (0.0-1.0) with shape (n_texts, n_categories),
+            columns in CATEGORIES order
+    """
+    if settings.model_backend == "onnx":
+        from app.services.onnx_model import run_onnx_inference
+
+        probabilities = run_onnx_inference(model, tokenizer, texts)
+        return _map_to_categories(probabilities)
+
+    import torch
+
+    # Tokenize all inputs into one padded batch
+    inputs = tokenize(texts)
+
+    if device is not None and device.type == "cuda":
+        slot = _acquire_buffer_slot()
+        try:
+            logits = _forward(model, _copy_to_device_buffers(inputs, device, slot))
+            probabilities = torch.sigmoid(logits.float()).cpu().numpy()
+        finally:
+            # Results are back on the host, so the slot's buffers are free again
+            _device_buffer_slots.put(slot)
+    else:
+        # CPU tensors are already where the model is
+        logits = _forward(model, inputs)
+        probabilities = torch.sigmoid(logits.float()).numpy()
+
+    return _map_to_categories(probabilities)
+
+
+def _forward(model, inputs: Dict[str, Any]):
+    """
+    Run the model on a tokenized batch.
+
+    Args:
+        model: Loaded torch model (eager or traced)
+        inputs: Tokenizer outputs on the model's device
+
+    Returns:
+        torch.Tensor: Logits with shape (n_texts, n_labels)
+    """
+    import torch
+
+    # inference_mode also skips autograd version tracking
+    with torch.inference_mode():
+        if settings.model_jit_trace:
+            # Traced graphs take positional inputs and return a plain dict
+            return model(inputs["input_ids"], inputs["attention_mask"])["logits"]
+        return model(**inputs).logits
+
+
+def _acquire_buffer_slot() -> Dict[str, Any]:
+    """
+    Take a free CUDA input buffer slot, or start a new one if all are in use.
+
+    Returns:
+        Dict[str, Any]: Buffer slot; return it to _device_buffer_slots when done
+    """
+    try:
+        return _device_buffer_slots.get_nowait()
+    except queue.Empty:
+        return {}
+
+
+def _copy_to_device_buffers(inputs: Dict[str, Any], device, slot: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy a tokenized batch into a slot's preallocated host and device tensors.
+
+    Buffers hold inference_batch_max_size rows of _MAX_SEQUENCE_LENGTH tokens,
+    so steady-state batches reuse them instead of allocating memory. The host
+    buffers are pinned once, so the host-to-device copies run asynchronously.
+
+    Args:
+        inputs: Tokenizer outputs on the host
+        device: CUDA device the model runs on
+        slot: Buffer slot owned by this batch (see _acquire_buffer_slot)
+
+    Returns:
+        Dict[str, torch.Tensor]: Contiguous views of the device buffers sized to the batch
+    """
+    import torch
+
+    device_inputs = {}
+    for name, tensor in inputs.items():
+        batch_size, seq_len = tensor.shape
+        size = batch_size * seq_len
+        buffers = slot.get(name)
+        if buffers is None or buffers[1].device != device or buffers[1].numel() < size:
+            rows = max(batch_size, settings.inference_batch_max_size)
+            # Flat buffers, so a (batch_size, seq_len) prefix view is contiguous
+            buffers = (
+                torch.zeros(rows * _MAX_SEQUENCE_LENGTH, dtype=tensor.dtype, pin_memory=True),
+                torch.zeros(rows * _MAX_SEQUENCE_LENGTH, dtype=tensor.dtype, device=device),
+            )
+            slot[name] = buffers
+
+        host_buffer, device_buffer = buffers
+        host_view = host_buffer[:size].view(batch_size, seq_len)
+        host_view.copy_(tensor)
+        view = device_buffer[:size].view(batch_size, seq_len)
+        view.copy_(host_view, non_blocking=True)
+        device_inputs[name] = view
+
+    return device_inputs
+
+
+async def run_inference_batch(
+    texts: List[str], model_name: Optional[str] = None
+) -> np.ndarray:
+    """
+    Run inference on a batch of text inputs in a single forward pass.
+
+    Args:
+        texts: Texts to moderate
         model_name: Model identifier (optional)
 
     Returns:
-        Dict[str, float]: Category scores (0.0-1.0)
+        np.ndarray: Category scores (0.0-1.0) with shape (n_texts, n_categories),
+            columns in CATEGORIES order
     """
+    # Run in dedicated worker processes when configured
+    if settings.inference_workers > 0:
+        from app.services.inference_pool import run_in_inference_pool
+
+        return await run_in_inference_pool(texts, model_name)
+
     # Load model if needed
-    model, tokenizer = await load_model(model_name)
+    loaded = await _get_loaded_model(model_name)
 
     # Run inference in thread pool
-    def _inference():
-        import torch
+    return await asyncio.to_thread(
+        _predict_sync, loaded.model, loaded.tokenizer, loaded.tokenize, loaded.device, texts
+    )
 
-        # Tokenize input
-        inputs = tokenizer(
-            text, return_tensors="pt", truncation=True, max_length=512, padding=True
-        )
 
-        # Move to same device as model
-        device = next(model.parameters()).device
-        inputs = {k: v.to(device) for k, v in inputs.items()}
+# Coalesces inference across concurrent requests (looked up at call time so it can be patched)
+_batch_runner = BatchRunner(
+    lambda texts, model_name: run_inference_batch(texts, model_name),
+    max_batch_size=settings.inference_batch_max_size,
+    max_wait_ms=settings.inference_batch_wait_ms,
+)
+
 
-        # Run inference
-        with torch.no_grad():
-            outputs = model(**inputs)
-            logits = outputs.logits
+# Recent scores kept in process so repeated texts skip Redis as well as the model
+_local_score_cache = LRUCache(settings.inproc_cache_size)
 
-        # Apply sigmoid to get probabilities
-        probabilities = torch.sigmoid(logits).cpu().numpy()[0]
+# Score cache lookups in this process (distinct texts per request), for health reporting
+_score_cache_hits = 0
+_score_cache_misses = 0
 
-        # Map toxic-bert labels to OpenAI moderation categories
-        # toxic-bert outputs: [toxic, severe_toxic, obscene, threat, insult, identity_hate]
-        # Our categories: [harassment, hate, profanity, sexual, spam, violence]
+# Scores are cached in Redis as raw float64 vectors in CATEGORIES order
+_SCORE_DTYPE = np.float64
+_SCORE_VECTOR_BYTES = len(CATEGORIES) * np.dtype(_SCORE_DTYPE).itemsize
 
-        # Mapping logic based on label semantics:
-        # - toxic/severe_toxic/insult → harassment (aggressive behavior)
-        # - identity_hate → hate (targeted discrimination)
-        # - obscene → profanity (inappropriate language)
-        # - threat → violence (threatening behavior)
-        # Note: toxic-bert doesn't have sexual/spam, so we derive them from other signals
+# Backend/precision tag for score cache keys, computed on first use
+_inference_variant_tag: Optional[str] = None
 
-        toxic_score = float(probabilities[0]) if len(probabilities) > 0 else 0.0
-        severe_toxic_score = float(probabilities[1]) if len(probabilities) > 1 else 0.0
-        obscene_score = float(probabilities[2]) if len(probabilities) > 2 else 0.0
-        threat_score = float(probabilities[3]) if len(probabilities) > 3 else 0.0
-        insult_score = float(probabilities[4]) if len(probabilities) > 4 else 0.0
-        identity_hate_score = float(probabilities[5]) if len(probabilities) > 5 else 0.0
 
-        scores = {
-            # Harassment: combination of toxic, insult, and severe_toxic
-            "harassment": max(insult_score, (toxic_score + severe_toxic_score) / 2),
+def _inference_variant() -> str:
+    """
+    Describe how scores are computed: backend, device and numeric precision.
 
-            # Hate: primarily identity_hate, boosted by severe_toxic
-            "hate": max(identity_hate_score, severe_toxic_score * 0.8),
+    Replicas sharing one Redis may run different settings, and each variant
+    produces slightly different scores, so it is part of the score cache key.
 
-            # Profanity: obscene language
-            "profanity": obscene_score,
+    Returns:
+        str: Variant tag (e.g. "torch-cpu-int8", "torch-cuda-float32", "onnx-int8")
+    """
+    global _inference_variant_tag
 
-            # Sexual: derive from obscene when combined with low threat/insult
-            # (obscene language that's not threatening/insulting is often sexual)
-            "sexual": obscene_score * 0.6 if threat_score < 0.5 and insult_score < 0.5 else obscene_score * 0.3,
+    if _inference_variant_tag is None:
+        if settings.model_backend == "onnx":
+            _inference_variant_tag = "onnx-int8"
+        else:
+            import torch
 
-            # Violence: threat-based content
-            "violence": threat_score,
+            if torch.cuda.is_available():
+                dtype_name = str(_gpu_dtype()).removeprefix("torch.")
+                _inference_variant_tag = f"torch-cuda-{dtype_name}"
+            elif settings.model_quantize_cpu:
+                _inference_variant_tag = "torch-cpu-int8"
+            else:
+                _inference_variant_tag = "torch-cpu-float32"
 
-            # Spam: derive from toxic patterns with low semantic content
-            # (repetitive toxic content with low specific category scores)
-            "spam": toxic_score * 0.3 if all(s < 0.4 for s in [insult_score, threat_score, obscene_score]) else 0.0,
-        }
+    return _inference_variant_tag
 
-        return scores
 
-    scores = await asyncio.to_thread(_inference)
-    return scores
+def _text_cache_key(text: str, model_name: str) -> bytes:
+    """
+    Create cache key for the scores of a single text.
+
+    The key ends in the raw content digest rather than its hex form; Redis
+    keys are binary-safe and the shorter key is cheaper to store and compare.
+
+    Args:
+        text: Input text
+        model_name: Model identifier
+
+    Returns:
+        bytes: Cache key (includes API version, backend and precision, so model
+            upgrades and inference setting changes invalidate it)
+    """
+    return (
+        f"cache:scores:{settings.api_version}:{_inference_variant()}:{model_name}:".encode()
+        + content_digest(text.encode())
+    )
+
+
+async def score_texts(texts: List[str], model_name: Optional[str] = None) -> np.ndarray:
+    """
+    Get category scores for texts, using the score caches when available.
+
+    Texts are looked up in the in-process LRU first, then the remaining ones
+    in Redis with one MGET; new scores are stored with one pipeline, so a
+    batch costs at most two Redis round-trips regardless of its size. Only
+    cache misses are sent to the model, batched with other concurrent requests.
+
+    Args:
+        texts: Texts to moderate
+        model_name: Model identifier (optional)
+
+    Returns:
+        np.ndarray: Category scores (0.0-1.0) with shape (n_texts, n_categories),
+            columns in CATEGORIES order
+    """
+    # If caching is disabled, run the model directly
+    if not settings.cache_enabled:
+        return _stack_scores(await _batch_runner.submit(texts, model_name))
+
+    resolved_model = model_name or settings.default_model
+    keys = [_text_cache_key(text, resolved_model) for text in texts]
+    text_by_key = dict(zip(keys, texts))
+
+    scores_by_key: Dict[bytes, np.ndarray] = {}
+    for key in text_by_key:
+        scores = _local_score_cache.get(key)
+        if scores is not None:
+            scores_by_key[key] = scores
+
+    redis_client = get_redis_client()
+    remote_keys = [key for key in text_by_key if key not in scores_by_key]
+
+    if remote_keys and redis_client is not None:
+        try:
+            cached = await redis_client.mget(remote_keys)
+        except Exception as e:
+            logger.error(f"Text cache lookup error: {e}")
+            cached = [None] * len(remote_keys)
+
+        for key, value in zip(remote_keys, cached):
+            # Entries written for a different category layout are treated as misses
+            if value and len(value) == _SCORE_VECTOR_BYTES:
+                scores_by_key[key] = np.frombuffer(value, dtype=_SCORE_DTYPE)
+                _remember_scores(key, text_by_key[key], scores_by_key[key])
+
+    # Score each distinct missing text once
+    misses = {key: text for key, text in text_by_key.items() if key not in scores_by_key}
+    _record_score_cache_lookups(len(text_by_key) - len(misses), len(misses))
+    if misses:
+        fresh_scores = await _batch_runner.submit(list(misses.values()), model_name)
+
+        for (key, text), scores in zip(misses.items(), fresh_scores):
+            scores_by_key[key] = scores
+            _remember_scores(key, text, scores)
+
+        if redis_client is not None:
+            pipe = redis_client.pipeline(transaction=False)
+            for key in misses:
+                pipe.setex(
+                    key,
+                    settings.cache_ttl_seconds,
+                    np.asarray(scores_by_key[key], dtype=_SCORE_DTYPE).tobytes(),
+                )
+
+            try:
+                await pipe.execute()
+            except Exception as e:
+                logger.error(f"Text cache storage error: {e}")
+
+    return _stack_scores([scores_by_key[key] for key in keys])
+
+
+def _record_score_cache_lookups(hits: int, misses: int) -> None:
+    """
+    Add to the score cache hit/miss counters.
+
+    Args:
+        hits: Texts served from the in-process or Redis cache
+        misses: Texts sent to the model
+    """
+    global _score_cache_hits, _score_cache_misses
+
+    _score_cache_hits += hits
+    _score_cache_misses += misses
+
+
+def get_score_cache_stats() -> tuple[int, int]:
+    """
+    Get score cache hit/miss counts since startup.
+
+    Returns:
+        tuple: (hits, misses)
+    """
+    return _score_cache_hits, _score_cache_misses
+
+
+def _stack_scores(rows) -> np.ndarray:
+    """
+    Stack per-text score vectors into one matrix.
+
+    Args:
+        rows: Score vectors in CATEGORIES order, one per text
+
+    Returns:
+        np.ndarray: Scores with shape (n_texts, n_categories)
+    """
+    return np.array(rows, dtype=_SCORE_DTYPE).reshape(len(rows), len(CATEGORIES))
+
+
+def _remember_scores(key: bytes, text: str, scores: np.ndarray) -> None:
+    """
+    Keep scores in the in-process cache unless the text is too large.
+
+    Args:
+        key: Text cache key
+        text: Scored text
+        scores: Category score vector for the text
+    """
+    if len(text) <= settings.inproc_cache_max_text_length:
+        _local_score_cache.set(key, scores)
 
 
 def apply_thresholds(
@@ -186,8 +752,10 @@ def apply_thresholds(
     """
     Apply thresholds to scores to determine if content is flagged.
 
+    One-row wrapper around apply_thresholds_batch for dict-based callers.
+
     Args:
-        scores: Category scores (0.0-1.0)
+        scores: Category scores (0.0-1.0); missing categories score 0.0
         custom_thresholds: Optional custom thresholds per category
 
     Returns:
@@ -195,56 +763,97 @@ def apply_thresholds(
             - flagged: True if any category exceeds threshold
             - category_flags: Boolean flags per category
     """
-    # Start with default thresholds
-    thresholds = settings.default_thresholds.copy()
+    score_row = np.array([[scores.get(category, 0.0) for category in CATEGORIES]])
+    flagged, category_flags = apply_thresholds_batch(
+        score_row, build_threshold_vector(custom_thresholds)
+    )
+    return bool(flagged[0]), dict(zip(CATEGORIES, category_flags[0].tolist()))
+
+
+def build_threshold_vector(
+    custom_thresholds: Optional[Dict[str, float]] = None,
+) -> np.ndarray:
+    """
+    Build the per-category threshold vector in CATEGORIES order.
+
+    Args:
+        custom_thresholds: Optional custom thresholds per category
+
+    Returns:
+        np.ndarray: Thresholds, one column per category (read-only when no overrides)
+    """
+    if not custom_thresholds:
+        return _DEFAULT_THRESHOLD_VECTOR
 
-    # Override with custom thresholds if provided
-    if custom_thresholds:
-        thresholds.update(custom_thresholds)
+    # Override with custom thresholds (unknown categories are ignored)
+    vector = _DEFAULT_THRESHOLD_VECTOR.copy()
+    for category, threshold in custom_thresholds.items():
+        index = CATEGORY_INDEX.get(category)
+        if index is not None:
+            vector[index] = threshold
 
-    # Apply thresholds
-    category_flags = {}
-    flagged = False
+    return vector
 
-    for category in CATEGORIES:
-        score = scores.get(category, 0.0)
-        threshold = thresholds.get(category, DEFAULT_THRESHOLDS.get(category, 0.5))
-        is_flagged = score >= threshold
-        category_flags[category] = is_flagged
 
-        if is_flagged:
-            flagged = True
+def apply_thresholds_batch(
+    scores: np.ndarray, thresholds: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Apply thresholds to a matrix of scores in one vectorized comparison.
+
+    Args:
+        scores: Scores with shape (n_inputs, n_categories), columns in CATEGORIES order
+        thresholds: Threshold vector with shape (n_categories,)
 
-    return flagged, category_flags
+    Returns:
+        tuple: (flagged, category_flags)
+            - flagged: Boolean array with shape (n_inputs,)
+            - category_flags: Boolean array with shape (n_inputs, n_categories)
+    """
+    category_flags = scores >= thresholds
+    return category_flags.any(axis=1), category_flags
 
 
-async def moderate_text(
-    text: str,
+async def moderate_text_batch(
+    texts: List[str],
     model_name: Optional[str] = None,
     custom_thresholds: Optional[Dict[str, float]] = None,
-    requested_categories: Optional[list] = None,
-) -> tuple[bool, Dict[str, bool], Dict[str, float]]:
+    requested_categories: Optional[Sequence[str]] = None,
+) -> tuple[tuple[str, ...], np.ndarray, np.ndarray, np.ndarray]:
     """
-    Moderate a single text input.
+    Moderate a batch of text inputs with a single model call.
+
+    Results are returned as parallel arrays (one row per text, one column per
+    category) so callers only build per-category dicts at the API boundary.
 
     Args:
-        text: Text to moderate
+        texts: Texts to moderate
         model_name: Model identifier (optional)
         custom_thresholds: Optional custom thresholds per category
-        requested_categories: Optional list of categories to return (filters output)
+        requested_categories: Optional categories to return, in the order
+            they should be returned (filters output; unknown names are ignored)
 
     Returns:
-        tuple: (flagged, category_flags, scores)
+        tuple: (categories, flagged, category_flags, scores)
+            - categories: Returned category names, in column order
+            - flagged: Boolean array with shape (n_texts,), over all categories
+            - category_flags: Boolean array with shape (n_texts, n_categories)
+            - scores: Float array with shape (n_texts, n_categories)
     """
-    # Run inference
-    scores = await run_inference(text, model_name)
-
-    # Apply thresholds
-    flagged, category_flags = apply_thresholds(scores, custom_thresholds)
-
-    # Filter results if specific categories requested
-    if requested_categories is not None:
-        scores = {cat: scores[cat] for cat in requested_categories if cat in scores}
-        category_flags = {cat: category_flags[cat] for cat in requested_categories if cat in category_flags}
-
-    return flagged, category_flags, scores
\ No newline at end of file
+    # Run batched inference (cached scores are reused)
+    scores_matrix = await score_texts(texts, model_name)
+
+    # Apply thresholds to all inputs at once
+    flagged, category_flags = apply_thresholds_batch(
+        scores_matrix, build_threshold_vector(custom_thresholds)
+    )
+
+    # Filter results if specific categories requested (flagged still considers all categories)
+    if requested_categories is None:
+        return CATEGORIES, flagged, category_flags, scores_matrix
+
+    categories = tuple(
+        category for category in requested_categories if category in CATEGORY_INDEX
+    )
+    columns = [CATEGORY_INDEX[category] for category in categories]
+    return categories, flagged, category_flags[:, columns], scores_matrix[:, columns]
@@ -0,0 +1,112 @@
+"""Optional ONNX Runtime inference backend with INT8 dynamic quantization.
+
+Requires ``optimum[onnxruntime]``; enabled with ``MODEL_BACKEND=onnx``.
+"""
+
+import logging
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+from app.config.settings import settings
+from app.services.moderation import _MAX_SEQUENCE_LENGTH, _intra_op_thread_count
+
+logger = logging.getLogger(__name__)
+
+# File written by ORTQuantizer next to the exported model
+QUANTIZED_MODEL_FILE = "model_quantized.onnx"
+
+
+def _export_dir(model_name: str) -> Path:
+    """
+    Get the directory holding the exported ONNX model.
+
+    Args:
+        model_name: Model identifier
+
+    Returns:
+        Path: Export directory inside the model cache
+    """
+    return Path(settings.model_cache_dir) / "onnx" / model_name.replace("/", "--")
+
+
+def load_onnx_model(model_name: str) -> tuple:
+    """
+    Load an INT8-quantized ONNX Runtime session, exporting it on first use.
+
+    This is blocking and should be run in a worker thread.
+
+    Args:
+        model_name: Model identifier
+
+    Returns:
+        tuple: (session, tokenizer)
+    """
+    import onnxruntime as ort
+    from transformers import AutoTokenizer
+
+    export_dir = _export_dir(model_name)
+    model_path = export_dir / QUANTIZED_MODEL_FILE
+
+    # Export and quantize once; later loads reuse the file in the model cache
+    if not model_path.exists():
+        from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+        logger.info(f"[MODEL] Exporting {model_name} to ONNX (INT8)")
+        ort_model = ORTModelForSequenceClassification.from_pretrained(
+            model_name, export=True, cache_dir=settings.model_cache_dir
+        )
+        ort_model.save_pretrained(export_dir)
+
+        quantizer = ORTQuantizer.from_pretrained(ort_model)
+        quantizer.quantize(
+            save_dir=export_dir,
+            quantization_config=AutoQuantizationConfig.avx512_vnni(
+                is_static=False, per_channel=False
+            ),
+        )
+
+    tokenizer = AutoTokenizer.from_pretrained(
+        model_name, cache_dir=settings.model_cache_dir, use_fast=True
+    )
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    # Same per-process thread budget as the PyTorch backend, so workers don't oversubscribe
+    options.intra_op_num_threads = _intra_op_thread_count()
+    options.inter_op_num_threads = 1
+    session = ort.InferenceSession(
+        str(model_path), sess_options=options, providers=["CPUExecutionProvider"]
+    )
+
+    return session, tokenizer
+
+
+def run_onnx_inference(session, tokenizer, texts: List[str]) -> np.ndarray:
+    """
+    Run a padded batch through the ONNX session.
+
+    Args:
+        session: ONNX Runtime inference session
+        tokenizer: Tokenizer matching the exported model
+        texts: Texts to score
+
+    Returns:
+        np.ndarray: Sigmoid probabilities with shape (n_texts, n_labels)
+    """
+    inputs = tokenizer(
+        texts,
+        return_tensors="np",
+        truncation=True,
+        max_length=_MAX_SEQUENCE_LENGTH,
+        padding=True,
+    )
+
+    # Only feed the inputs the exported graph declares (e.g. no token_type_ids)
+    input_names = {model_input.name for model_input in session.get_inputs()}
+    feed = {name: value for name, value in inputs.items() if name in input_names}
+
+    logits = session.run(None, feed)[0]
+    return 1.0 / (1.0 + np.exp(-logits.astype(np.float32)))
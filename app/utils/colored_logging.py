@@ -1,6 +1,7 @@
 """Colored logging formatter for better visibility."""
 
 import logging
+import re
 
 
 class ColoredFormatter(logging.Formatter):
@@ -21,6 +22,18 @@ class ColoredFormatter(logging.Formatter):
         'MAGENTA': '\033[35m',    # Magenta
     }
 
+    # Color per highlighted log tag (cache, model, Redis and rate limit operations)
+    _TAG_COLORS = {
+        'CACHE HIT': COLORS['CACHE_HIT'],
+        'CACHE MISS': COLORS['CACHE_MISS'],
+        'CACHE STORED': COLORS['BLUE'],
+        'MODEL': COLORS['MAGENTA'],
+        'REDIS': COLORS['BLUE'],
+        'RATE LIMIT': COLORS['WARNING'],
+    }
+    _TAG_PATTERN = re.compile(r'\[(CACHE HIT|CACHE MISS|CACHE STORED|MODEL|REDIS|RATE LIMIT)\]')
+    _RESET = COLORS['RESET']
+
     def format(self, record):
         """Format log record with colors."""
         # Add color based on level
@@ -31,45 +44,12 @@ class ColoredFormatter(logging.Formatter):
         # Call parent formatter first to get the formatted message
         formatted = super().format(record)
 
-        # Highlight cache operations with colors
-        if '[CACHE HIT]' in formatted:
-            formatted = formatted.replace(
-                '[CACHE HIT]',
-                f"{self.COLORS['CACHE_HIT']}[CACHE HIT]{self.COLORS['RESET']}"
-            )
-        elif '[CACHE MISS]' in formatted:
-            formatted = formatted.replace(
-                '[CACHE MISS]',
-                f"{self.COLORS['CACHE_MISS']}[CACHE MISS]{self.COLORS['RESET']}"
-            )
-        elif '[CACHE STORED]' in formatted:
-            formatted = formatted.replace(
-                '[CACHE STORED]',
-                f"{self.COLORS['BLUE']}[CACHE STORED]{self.COLORS['RESET']}"
-            )
-
-        # Highlight model operations
-        if '[MODEL]' in formatted:
-            formatted = formatted.replace(
-                '[MODEL]',
-                f"{self.COLORS['MAGENTA']}[MODEL]{self.COLORS['RESET']}"
-            )
-
-        # Highlight Redis operations
-        if '[REDIS]' in formatted:
-            formatted = formatted.replace(
-                '[REDIS]',
-                f"{self.COLORS['BLUE']}[REDIS]{self.COLORS['RESET']}"
-            )
-
-        # Highlight rate limit
-        if '[RATE LIMIT]' in formatted:
-            formatted = formatted.replace(
-                '[RATE LIMIT]',
-                f"{self.COLORS['WARNING']}[RATE LIMIT]{self.COLORS['RESET']}"
-            )
+        # Highlight tagged operations in a single scan
+        return self._TAG_PATTERN.sub(self._color_tag, formatted)
 
-        return formatted
+    def _color_tag(self, match):
+        """Wrap a matched [TAG] in its color codes."""
+        return f"{self._TAG_COLORS[match.group(1)]}{match.group(0)}{self._RESET}"
 
 
 def setup_colored_logging():
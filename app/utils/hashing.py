@@ -0,0 +1,32 @@
+"""Content hashing utilities for cache keys."""
+
+import hashlib
+
+# Cached verdicts are shared across clients and keyed by client-supplied text,
+# so keys must resist crafted collisions: a non-cryptographic hash (e.g. XXH3)
+# would let an attacker give toxic text a benign cached result. blake2b is
+# cryptographic and still fast; 16-byte digests (32 hex chars) keep keys short.
+DIGEST_SIZE = 16
+
+
+def new_hasher():
+    """
+    Create an incremental hasher for content that arrives in chunks.
+
+    Returns:
+        hashlib.blake2b: Hasher producing DIGEST_SIZE-byte digests
+    """
+    return hashlib.blake2b(digest_size=DIGEST_SIZE)
+
+
+def content_digest(data: bytes) -> bytes:
+    """
+    Hash content for use in a binary cache key.
+
+    Args:
+        data: Content bytes
+
+    Returns:
+        bytes: Raw digest (DIGEST_SIZE bytes), half the size of the hex form
+    """
+    return hashlib.blake2b(data, digest_size=DIGEST_SIZE).digest()
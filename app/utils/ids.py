@@ -1,6 +1,6 @@
-"""UUID generation utilities."""
+"""Request ID generation utilities."""
 
-import uuid
+import os
 
 
 def generate_request_id() -> str:
@@ -8,9 +8,9 @@ def generate_request_id() -> str:
     Generate a unique request ID.
 
     Returns:
-        str: Request ID in format 'req_<uuid>'
+        str: Request ID in format 'req_<12 hex chars>'
     """
-    return f"req_{uuid.uuid4().hex[:12]}"
+    return "req_" + os.urandom(6).hex()
 
 
 def generate_error_request_id() -> str:
@@ -18,6 +18,6 @@ def generate_error_request_id() -> str:
     Generate a unique error request ID.
 
     Returns:
-        str: Error request ID in format 'req_error_<uuid>'
+        str: Error request ID in format 'req_error_<8 hex chars>'
     """
-    return f"req_error_{uuid.uuid4().hex[:8]}"
\ No newline at end of file
+    return "req_error_" + os.urandom(4).hex()
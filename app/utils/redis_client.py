@@ -2,8 +2,8 @@
 
 import logging
 from typing import Optional
-import redis
-from redis.connection import ConnectionPool
+import redis.asyncio as redis
+from redis.asyncio.connection import BlockingConnectionPool, ConnectionPool
 
 from app.config.settings import settings
 
@@ -15,16 +15,21 @@ _redis_client: Optional[redis.Redis] = None
 _redis_available: bool = False
 
 
-def init_redis_pool() -> None:
+async def init_redis_pool() -> None:
     """
     Initialize Redis connection pool.
 
-    This should be called on application startup.
+    This should be called on application startup. The client is created once
+    and shared by every caller of get_redis_client().
     """
     global _redis_pool, _redis_client, _redis_available
 
     try:
-        _redis_pool = ConnectionPool(
+        # Blocking pool: waits for a free connection instead of failing (or
+        # opening a connect storm) when max_connections is reached under load.
+        # RESP parsing uses hiredis automatically when it is installed.
+        _redis_pool = BlockingConnectionPool(
+            timeout=settings.redis_socket_timeout,
             host=settings.redis_host,
             port=settings.redis_port,
             db=settings.redis_db,
@@ -33,13 +38,16 @@ def init_redis_pool() -> None:
             socket_timeout=settings.redis_socket_timeout,
             socket_connect_timeout=settings.redis_socket_connect_timeout,
             retry_on_timeout=settings.redis_retry_on_timeout,
-            decode_responses=True,
+            socket_keepalive=True,
+            # PING connections idle this long before reuse instead of failing a command
+            health_check_interval=settings.redis_health_check_interval,
+            decode_responses=False,
         )
 
         _redis_client = redis.Redis(connection_pool=_redis_pool)
 
         # Test connection
-        _redis_client.ping()
+        await _redis_client.ping()
         _redis_available = True
         logger.info("[REDIS] Connection pool initialized successfully")
 
@@ -70,7 +78,7 @@ def is_redis_available() -> bool:
     return _redis_available
 
 
-def close_redis_pool() -> None:
+async def close_redis_pool() -> None:
     """
     Close Redis connection pool.
 
@@ -78,8 +86,11 @@ def close_redis_pool() -> None:
     """
     global _redis_pool, _redis_client, _redis_available
 
+    if _redis_client is not None:
+        await _redis_client.aclose()
+
     if _redis_pool is not None:
-        _redis_pool.disconnect()
+        await _redis_pool.disconnect()
         logger.info("Redis connection pool closed")
 
     _redis_pool = None
@@ -101,10 +112,9 @@ async def check_redis_health() -> tuple[bool, Optional[int]]:
     try:
         import time
 
-        start = time.perf_counter()
-        client.ping()
-        end = time.perf_counter()
-        latency_ms = int((end - start) * 1000)
+        start = time.perf_counter_ns()
+        await client.ping()
+        latency_ms = (time.perf_counter_ns() - start) // 1_000_000
         return True, latency_ms
     except Exception as e:
         logger.error(f"Redis health check failed: {e}")
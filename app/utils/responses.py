@@ -0,0 +1,22 @@
+"""Custom response classes."""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response serialized with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        """
+        Serialize content to JSON bytes.
+
+        Args:
+            content: Response content
+
+        Returns:
+            bytes: JSON-encoded content
+        """
+        return orjson.dumps(content)
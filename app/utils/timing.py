@@ -4,6 +4,9 @@ import time
 from contextlib import contextmanager
 from typing import Generator
 
+# Last formatted second: (epoch_second, "YYYY-MM-DDTHH:MM:SS")
+_ts_cache = (0, "")
+
 
 @contextmanager
 def timer() -> Generator[dict, None, None]:
@@ -20,21 +23,28 @@ def timer() -> Generator[dict, None, None]:
         >>> print(t['elapsed_ms'])
     """
     result = {"elapsed_ms": 0}
-    start = time.perf_counter()
+    start = time.perf_counter_ns()
     try:
         yield result
     finally:
-        end = time.perf_counter()
-        result["elapsed_ms"] = int((end - start) * 1000)
+        result["elapsed_ms"] = (time.perf_counter_ns() - start) // 1_000_000
 
 
 def get_current_timestamp_iso() -> str:
     """
     Get current timestamp in ISO 8601 UTC format.
 
+    The second-resolution prefix is formatted once per second and reused;
+    each call only formats the milliseconds.
+
     Returns:
         str: Current timestamp (e.g., '2025-09-29T22:10:05.123Z')
     """
-    from datetime import datetime, timezone
-
-    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
\ No newline at end of file
+    global _ts_cache
+
+    second, millis = divmod(time.time_ns() // 1_000_000, 1000)
+    cached_second, prefix = _ts_cache
+    if cached_second != second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _ts_cache = (second, prefix)
+    return f"{prefix}.{millis:03d}Z"
\ No newline at end of file
@@ -1,9 +1,14 @@
 """Shared fixtures for pytest."""
 
+import asyncio
+import numpy as np
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import Mock, AsyncMock, patch
 
+import app.services.health as health_service
+import app.services.inference_pool as inference_pool
+import app.services.moderation as moderation_service
 from app.main import app
 from app.config.settings import settings
 
@@ -16,16 +21,25 @@ def client():
 
 @pytest.fixture
 def mock_redis():
-    """Mock Redis client."""
+    """Mock async Redis client."""
     mock = Mock()
-    mock.ping.return_value = True
-    mock.get.return_value = None
-    mock.setex.return_value = True
-    mock.zadd.return_value = 1
-    mock.zcard.return_value = 0
-    mock.zrange.return_value = []
-    mock.zremrangebyscore.return_value = 0
-    mock.expire.return_value = True
+    mock.ping = AsyncMock(return_value=True)
+    mock.get = AsyncMock(return_value=None)
+    mock.mget = AsyncMock(side_effect=lambda keys: [None] * len(keys))
+    mock.setex = AsyncMock(return_value=True)
+    mock.hgetall = AsyncMock(return_value={})
+    mock.register_script.return_value = AsyncMock(return_value=[0, 0, 0])
+    mock.hset = AsyncMock(return_value=1)
+    mock.zadd = AsyncMock(return_value=1)
+    mock.zcard = AsyncMock(return_value=0)
+    mock.zrange = AsyncMock(return_value=[])
+    mock.zremrangebyscore = AsyncMock(return_value=0)
+    mock.expire = AsyncMock(return_value=True)
+
+    # Pipelines buffer commands synchronously and only await execute()
+    pipe = Mock()
+    pipe.execute = AsyncMock(return_value=[])
+    mock.pipeline.return_value = pipe
     return mock
 
 
@@ -63,37 +77,84 @@ def sample_moderation_request_with_thresholds():
 
 
 @pytest.fixture
-def mock_model_inference():
-    """Mock model inference."""
-    with patch("app.services.moderation.run_inference") as mock:
-        mock.return_value = AsyncMock(
-            return_value={
-                "harassment": 0.1,
-                "hate": 0.05,
-                "profanity": 0.02,
-                "sexual": 0.01,
-                "spam": 0.03,
-                "violence": 0.04,
-            }
+def batch_outcome():
+    """Build a moderate_text_batch return value that repeats one result per text."""
+
+    def _build(result, n_texts):
+        flagged, category_flags, scores = result
+        categories = tuple(category_flags)
+        shape = (n_texts, len(categories))
+        flag_row = [category_flags[c] for c in categories]
+        score_row = [scores[c] for c in categories]
+        return (
+            categories,
+            np.full(n_texts, flagged, dtype=bool),
+            np.array([flag_row] * n_texts, dtype=bool).reshape(shape),
+            np.array([score_row] * n_texts, dtype=np.float64).reshape(shape),
         )
-        yield mock
+
+    return _build
+
+
+# Canned moderate_text_batch outcomes: (flagged, category_flags, scores)
+NOT_FLAGGED_RESULT = (
+    False,
+    {
+        "harassment": False,
+        "hate": False,
+        "profanity": False,
+        "sexual": False,
+        "spam": False,
+        "violence": False,
+    },
+    {
+        "harassment": 0.1,
+        "hate": 0.05,
+        "profanity": 0.02,
+        "sexual": 0.01,
+        "spam": 0.03,
+        "violence": 0.04,
+    },
+)
+
+FLAGGED_RESULT = (
+    True,
+    {
+        "harassment": True,
+        "hate": True,
+        "profanity": True,
+        "sexual": False,
+        "spam": False,
+        "violence": False,
+    },
+    {
+        "harassment": 0.9,
+        "hate": 0.85,
+        "profanity": 0.8,
+        "sexual": 0.1,
+        "spam": 0.05,
+        "violence": 0.2,
+    },
+)
+
+
+def _patch_moderation(monkeypatch, batch_outcome, result):
+    """Replace the endpoint's batch moderation with one returning result for every input."""
+    mock = AsyncMock(side_effect=lambda texts, **kwargs: batch_outcome(result, len(texts)))
+    monkeypatch.setattr("app.api.v1.moderate.moderate_text_batch", mock)
+    return mock
 
 
 @pytest.fixture
-def mock_toxic_inference():
-    """Mock toxic content inference."""
-    with patch("app.services.moderation.run_inference") as mock:
-        mock.return_value = AsyncMock(
-            return_value={
-                "harassment": 0.9,
-                "hate": 0.85,
-                "profanity": 0.8,
-                "sexual": 0.1,
-                "spam": 0.05,
-                "violence": 0.2,
-            }
-        )
-        yield mock
+def moderation_mock_not_flagged(monkeypatch, batch_outcome):
+    """Mock moderation that reports every input as clean."""
+    return _patch_moderation(monkeypatch, batch_outcome, NOT_FLAGGED_RESULT)
+
+
+@pytest.fixture
+def moderation_mock_flagged(monkeypatch, batch_outcome):
+    """Mock moderation that flags every input for harassment, hate and profanity."""
+    return _patch_moderation(monkeypatch, batch_outcome, FLAGGED_RESULT)
 
 
 @pytest.fixture(autouse=True)
@@ -106,15 +167,27 @@ def mock_redis_for_tests(mock_redis):
 @pytest.fixture(autouse=True)
 def reset_model_state():
     """Reset global model state before each test."""
-    import app.services.moderation as mod
-    mod._model = None
-    mod._tokenizer = None
-    mod._model_lock = __import__('threading').Lock()
-    mod._model_load_time = None
-    mod._model_name = None
+    moderation_service._loaded = None
+    moderation_service._model_lock = asyncio.Lock()
+    moderation_service._inference_variant_tag = None
+    inference_pool._pool_model = None
+    yield
+    moderation_service._inference_variant_tag = None
+    moderation_service._loaded = None
+    inference_pool._pool_model = None
+
+
+@pytest.fixture(autouse=True)
+def reset_health_cache():
+    """Reset the cached health result before each test."""
+    health_service._health_cache = None
+    yield
+    health_service._health_cache = None
+
+
+@pytest.fixture(autouse=True)
+def reset_local_score_cache():
+    """Clear the in-process score cache before each test."""
+    moderation_service._local_score_cache.clear()
     yield
-    # Clean up after test
-    mod._model = None
-    mod._tokenizer = None
-    mod._model_load_time = None
-    mod._model_name = None
\ No newline at end of file
+    moderation_service._local_score_cache.clear()
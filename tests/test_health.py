@@ -78,4 +78,37 @@ class TestHealthEndpoint:
                         assert (
                             data["components"]["model"]["name"] == "unitary/toxic-bert"
                         )
-                        assert data["components"]["model"]["load_time_seconds"] == 12.5
\ No newline at end of file
+                        assert data["components"]["model"]["load_time_seconds"] == 12.5
+
+    def test_health_result_cached(self, client):
+        """Test that probes within the cache TTL share one Redis check."""
+        with patch(
+            "app.services.health.check_redis_health", new_callable=AsyncMock
+        ) as mock_redis_health:
+            mock_redis_health.return_value = (True, 2)
+
+            first = client.get("/v1/health")
+            second = client.get("/v1/health")
+
+            assert first.status_code == 200
+            assert second.status_code == 200
+            assert second.json()["components"] == first.json()["components"]
+            mock_redis_health.assert_awaited_once()
+
+    def test_health_reports_cache_hit_rate(self, client):
+        """Test that score cache hits and misses are reported."""
+        with patch(
+            "app.services.health.check_redis_health", new_callable=AsyncMock
+        ) as mock_redis_health:
+            with patch("app.services.health.get_score_cache_stats") as mock_cache_stats:
+                mock_redis_health.return_value = (True, 2)
+                mock_cache_stats.return_value = (3, 1)
+
+                response = client.get("/v1/health")
+
+                assert response.status_code == 200
+                cache = response.json()["components"]["cache"]
+                assert cache["status"] == "enabled"
+                assert cache["hits"] == 3
+                assert cache["misses"] == 1
+                assert cache["hit_rate"] == 0.75
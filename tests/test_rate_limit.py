@@ -1,53 +1,78 @@
 """Tests for rate limiting middleware."""
 
 import pytest
-from unittest.mock import Mock, patch, AsyncMock
+from unittest.mock import Mock, patch
 from fastapi.testclient import TestClient
 
 from app.main import app
+from app.middleware.rate_limit import WINDOW_COUNTER_LUA
+
+
+def _at_window_second(second):
+    """Build a time_ns() value that falls `second` seconds into a 60s window."""
+    return (1_000_000 * 60 + second) * 1_000_000_000
 
 
 class TestRateLimiting:
     """Test cases for rate limiting."""
 
-    def test_rate_limit_not_exceeded(self, client, mock_redis):
+    def test_rate_limit_not_exceeded(self, client, mock_redis, moderation_mock_not_flagged):
         """Test request when rate limit is not exceeded."""
-        mock_redis.zcard.return_value = 50  # Below limit (100)
-
-        with patch("app.api.v1.moderate.moderate_text", new_callable=AsyncMock) as mock_moderate:
-            mock_moderate.return_value = (
-                False,
-                {
-                    "harassment": False,
-                    "hate": False,
-                    "profanity": False,
-                    "sexual": False,
-                    "spam": False,
-                    "violence": False,
-                },
-                {
-                    "harassment": 0.1,
-                    "hate": 0.05,
-                    "profanity": 0.02,
-                    "sexual": 0.01,
-                    "spam": 0.03,
-                    "violence": 0.04,
-                },
+        with patch("app.middleware.rate_limit.get_redis_client", return_value=mock_redis):
+            # current (incl. this request), previous, status: allowed
+            script = mock_redis.register_script.return_value
+            script.return_value = [50, 0, 0]
+
+            response = client.post(
+                "/v1/moderate",
+                json={"inputs": [{"text": "Hello"}], "return_scores": True},
             )
 
+            assert response.status_code == 200
+            script.assert_awaited_once()
+            mock_redis.register_script.assert_called_once_with(WINDOW_COUNTER_LUA)
+
+    def test_rate_limit_allowed_with_previous_window(
+        self, client, mock_redis, moderation_mock_not_flagged
+    ):
+        """Test that a busy previous window still allows requests once its share decays."""
+        with patch("app.middleware.rate_limit.get_redis_client", return_value=mock_redis), \
+                patch("app.middleware.rate_limit.time.time_ns", return_value=_at_window_second(45)):
+            # 40 + 120 * 15/60 = 70 < 100
+            script = mock_redis.register_script.return_value
+            script.return_value = [41, 120, 0]
+
             response = client.post(
                 "/v1/moderate",
                 json={"inputs": [{"text": "Hello"}], "return_scores": True},
             )
 
             assert response.status_code == 200
+            args = script.call_args.kwargs["args"]
+            assert args[:3] == [100, 15_000, 60_000]
 
     def test_rate_limit_exceeded(self, client, mock_redis):
-        """Test request when rate limit is exceeded."""
-        # Ensure Redis client returns the mock, not None
-        with patch("app.middleware.rate_limit.get_redis_client", return_value=mock_redis):
-            mock_redis.zcard.return_value = 150  # Above limit (100)
-            mock_redis.zrange.return_value = [(str(1234567890), 1234567890)]
+        """Test request when the current window alone is full."""
+        with patch("app.middleware.rate_limit.get_redis_client", return_value=mock_redis), \
+                patch("app.middleware.rate_limit.time.time_ns", return_value=_at_window_second(15)):
+            # current, previous, status: rejected
+            mock_redis.register_script.return_value.return_value = [100, 0, -1]
+
+            response = client.post(
+                "/v1/moderate",
+                json={"inputs": [{"text": "Hello"}], "return_scores": True},
+            )
+
+            assert response.status_code == 429
+            # Retry once the window rolls over (45s left)
+            assert response.headers["Retry-After"] == "46"
+
+    def test_rate_limit_exceeded_previous_window(self, client, mock_redis):
+        """Test Retry-After when the previous window's weighted share is over the limit."""
+        with patch("app.middleware.rate_limit.get_redis_client", return_value=mock_redis), \
+                patch("app.middleware.rate_limit.time.time_ns", return_value=_at_window_second(15)):
+            # 40 + 120 * 45/60 = 130 >= 100
+            mock_redis.register_script.return_value.return_value = [40, 120, -1]
 
             response = client.post(
                 "/v1/moderate",
@@ -55,36 +80,53 @@ class TestRateLimiting:
             )
 
             assert response.status_code == 429
-            assert "Retry-After" in response.headers
+            # After 15s: 40 + 120 * 30/60 = 100, still full; allowed a second later
+            assert response.headers["Retry-After"] == "16"
 
-    def test_rate_limit_disabled(self, client, mock_redis):
+    def test_rate_limit_disabled(self, client, mock_redis, moderation_mock_not_flagged):
         """Test that rate limiting can be disabled."""
         with patch("app.config.settings.settings.rate_limit_enabled", False):
-            with patch("app.api.v1.moderate.moderate_text", new_callable=AsyncMock) as mock_moderate:
-                mock_moderate.return_value = (
-                    False,
-                    {
-                        "harassment": False,
-                        "hate": False,
-                        "profanity": False,
-                        "sexual": False,
-                        "spam": False,
-                        "violence": False,
-                    },
-                    {
-                        "harassment": 0.1,
-                        "hate": 0.05,
-                        "profanity": 0.02,
-                        "sexual": 0.01,
-                        "spam": 0.03,
-                        "violence": 0.04,
-                    },
-                )
-
-                # Should not check rate limit
-                response = client.post(
-                    "/v1/moderate",
-                    json={"inputs": [{"text": "Hello"}], "return_scores": True},
-                )
-
-                assert response.status_code == 200
\ No newline at end of file
+            # Should not check rate limit
+            response = client.post(
+                "/v1/moderate",
+                json={"inputs": [{"text": "Hello"}], "return_scores": True},
+            )
+
+            assert response.status_code == 200
+
+    def test_rate_limit_sliding_log_single_script_call(
+        self, client, mock_redis, moderation_mock_not_flagged
+    ):
+        """Test that the sliding-log check runs as one atomic script call."""
+        with patch("app.middleware.rate_limit.get_redis_client", return_value=mock_redis), \
+                patch("app.config.settings.settings.rate_limit_strategy", "sliding_log"):
+            response = client.post(
+                "/v1/moderate",
+                json={"inputs": [{"text": "Hello"}], "return_scores": False},
+            )
+
+            assert response.status_code == 200
+            script = mock_redis.register_script.return_value
+            script.assert_awaited_once()
+            assert script.call_args.kwargs["keys"] == [
+                "rate_limit:testclient:/v1/moderate",
+                "rate_limit:testclient:/v1/moderate:seq",
+            ]
+            mock_redis.zrange.assert_not_called()
+
+    def test_rate_limit_sliding_log_exceeded(self, client, mock_redis):
+        """Test Retry-After from the script's oldest entry when the sliding log rejects."""
+        with patch("app.middleware.rate_limit.get_redis_client", return_value=mock_redis), \
+                patch("app.config.settings.settings.rate_limit_strategy", "sliding_log"), \
+                patch("app.middleware.rate_limit.time.time_ns", return_value=1_000_030_000_000_000):
+            # Script rejects the request and reports the oldest entry (30s before now)
+            mock_redis.register_script.return_value.return_value = [150, -1, 1_000_000_000_000]
+
+            response = client.post(
+                "/v1/moderate",
+                json={"inputs": [{"text": "Hello"}], "return_scores": True},
+            )
+
+            assert response.status_code == 429
+            assert response.headers["Retry-After"] == "30"
+            mock_redis.zrange.assert_not_called()
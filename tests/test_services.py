@@ -1,7 +1,37 @@
 """Tests for service layer."""
 
+import asyncio
+import multiprocessing
 import pytest
-from app.services.moderation import apply_thresholds
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+
+from app.config.categories import CATEGORIES
+from app.services.moderation import (
+    _map_to_categories,
+    apply_thresholds,
+    apply_thresholds_batch,
+    build_threshold_vector,
+    get_loaded_model_name,
+    get_model_load_time,
+    is_model_loaded,
+    moderate_text_batch,
+    run_inference_batch,
+    score_texts,
+    warm_up_model,
+)
+import app.services.inference_pool as inference_pool
+import app.services.moderation as moderation_service
+from app.services.batching import BatchRunner
+from app.utils.hashing import DIGEST_SIZE, content_digest
+
+
+def score_vector(scores):
+    """Build a category score vector in CATEGORIES order from a dict."""
+    return np.array([scores.get(category, 0.0) for category in CATEGORIES])
 
 
 class TestModerationService:
@@ -83,6 +113,268 @@ class TestModerationService:
         assert flagged is True
         assert category_flags["harassment"] is True  # 0.7 >= 0.7
 
+    def test_apply_thresholds_batch(self):
+        """Test vectorized threshold application over several inputs."""
+        thresholds = build_threshold_vector({"profanity": 0.5, "unknown": 0.1})
+        scores = np.array(
+            [
+                [0.1, 0.05, 0.02, 0.01, 0.03, 0.04],
+                [0.7, 0.05, 0.55, 0.01, 0.03, 0.04],
+            ]
+        )
+
+        flagged, category_flags = apply_thresholds_batch(scores, thresholds)
+
+        assert flagged.tolist() == [False, True]
+        assert category_flags[1].tolist() == [True, False, True, False, False, False]
+
+    def test_map_to_categories(self):
+        """Test vectorized toxic-bert label mapping for a batch."""
+        probabilities = np.array(
+            [
+                # toxic, severe_toxic, obscene, threat, insult, identity_hate
+                [0.2, 0.0, 0.1, 0.0, 0.0, 0.0],
+                [0.9, 0.5, 0.8, 0.1, 0.6, 0.3],
+            ],
+            dtype=np.float32,
+        )
+
+        scores = _map_to_categories(probabilities)
+
+        assert scores.shape == (2, 6)
+        assert scores[0].tolist() == pytest.approx([0.1, 0.0, 0.1, 0.06, 0.06, 0.0])
+        assert scores[1].tolist() == pytest.approx([0.7, 0.4, 0.8, 0.24, 0.0, 0.1])
+
+    def test_build_threshold_vector_defaults_shared(self):
+        """Test that the default vector is reused and never modified by overrides."""
+        defaults = build_threshold_vector()
+
+        assert build_threshold_vector(None) is defaults
+        assert build_threshold_vector({"harassment": 0.1})[0] == pytest.approx(0.1)
+        assert defaults[0] == pytest.approx(0.7)
+
+    @pytest.mark.asyncio
+    async def test_moderate_text_batch(self):
+        """Test batch moderation applies thresholds per input in order."""
+        clean = {
+            "harassment": 0.1,
+            "hate": 0.05,
+            "profanity": 0.02,
+            "sexual": 0.01,
+            "spam": 0.03,
+            "violence": 0.04,
+        }
+        toxic = dict(clean, harassment=0.9)
+
+        with patch(
+            "app.services.moderation.run_inference_batch", new_callable=AsyncMock
+        ) as mock_inference:
+            mock_inference.return_value = np.array([score_vector(clean), score_vector(toxic)])
+
+            categories, flagged, category_flags, scores = await moderate_text_batch(
+                ["Hello", "You are awful"],
+                requested_categories=("harassment",),
+            )
+
+            mock_inference.assert_awaited_once_with(["Hello", "You are awful"], None)
+            assert categories == ("harassment",)
+            assert flagged.tolist() == [False, True]
+            assert category_flags.tolist() == [[False], [True]]
+            assert scores.tolist() == [[0.1], [0.9]]
+
+    @pytest.mark.asyncio
+    async def test_moderate_text_batch_keeps_requested_order(self):
+        """Test that filtered categories come back in the caller's order."""
+        scores = score_vector({"harassment": 0.9, "violence": 0.2})
+
+        with patch(
+            "app.services.moderation.run_inference_batch", new_callable=AsyncMock
+        ) as mock_inference:
+            mock_inference.return_value = np.array([scores])
+
+            categories, _, category_flags, filtered = await moderate_text_batch(
+                ["text"], requested_categories=("violence", "unknown", "harassment")
+            )
+
+            assert categories == ("violence", "harassment")
+            assert category_flags.tolist() == [[False, True]]
+            assert filtered.tolist() == [[0.2, 0.9]]
+
+    @pytest.mark.asyncio
+    async def test_score_texts_uses_cache(self, mock_redis):
+        """Test that cached scores skip inference and misses are stored."""
+        cached_scores = score_vector({"harassment": 0.2})
+        fresh_scores = score_vector({"harassment": 0.9})
+        mock_redis.mget.side_effect = None
+        mock_redis.mget.return_value = [cached_scores.tobytes(), None]
+
+        with patch("app.services.moderation.get_redis_client", return_value=mock_redis):
+            with patch(
+                "app.services.moderation.run_inference_batch", new_callable=AsyncMock
+            ) as mock_inference:
+                mock_inference.return_value = np.array([fresh_scores])
+
+                results = await score_texts(["cached", "fresh"])
+
+                assert results.tolist() == [cached_scores.tolist(), fresh_scores.tolist()]
+                mock_inference.assert_awaited_once_with(["fresh"], None)
+                pipe = mock_redis.pipeline.return_value
+                assert pipe.setex.call_count == 1
+                pipe.execute.assert_awaited_once()
+
+                # Keys end in the raw 16-byte content digest, not its hex form
+                stored_key = pipe.setex.call_args.args[0]
+                assert stored_key.endswith(content_digest(b"fresh"))
+                assert len(content_digest(b"fresh")) == DIGEST_SIZE == 16
+
+    def test_text_cache_key_includes_inference_variant(self):
+        """Test that scores from different backends or precisions never share a key."""
+        keys = set()
+        for backend, quantize in [("torch", True), ("torch", False), ("onnx", True)]:
+            moderation_service._inference_variant_tag = None
+            with patch("app.config.settings.settings.model_backend", backend), \
+                    patch("app.config.settings.settings.model_quantize_cpu", quantize), \
+                    patch("torch.cuda.is_available", return_value=False):
+                keys.add(moderation_service._text_cache_key("text", "unitary/toxic-bert"))
+
+        assert len(keys) == 3
+
+    @pytest.mark.asyncio
+    async def test_score_texts_local_cache(self, mock_redis):
+        """Test that repeated texts are served from the in-process cache."""
+        scores = score_vector({"harassment": 0.9})
+
+        with patch("app.services.moderation.get_redis_client", return_value=mock_redis):
+            with patch(
+                "app.services.moderation.run_inference_batch", new_callable=AsyncMock
+            ) as mock_inference:
+                mock_inference.return_value = np.array([scores])
+
+                first = await score_texts(["repeat"])
+                second = await score_texts(["repeat", "repeat"])
+
+                assert first.tolist() == [scores.tolist()]
+                assert second.tolist() == [scores.tolist(), scores.tolist()]
+
+                mock_inference.assert_awaited_once()
+                mock_redis.mget.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_warm_up_model(self):
+        """Test that warm-up loads the model and runs one forward pass."""
+        with patch("app.services.moderation.load_model", new_callable=AsyncMock) as mock_load:
+            with patch(
+                "app.services.moderation.run_inference_batch", new_callable=AsyncMock
+            ) as mock_inference:
+                await warm_up_model()
+
+                mock_load.assert_awaited_once()
+                mock_inference.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_run_inference_batch_uses_worker_pool(self):
+        """Test that inference is sent to worker processes when configured."""
+        scores = np.array([score_vector({"harassment": 0.9})])
+        with patch("app.config.settings.settings.inference_workers", 2):
+            with patch(
+                "app.services.inference_pool.run_in_inference_pool", new_callable=AsyncMock
+            ) as mock_pool, patch(
+                "app.services.moderation.load_model", new_callable=AsyncMock
+            ) as mock_load:
+                mock_pool.return_value = scores
+
+                assert await run_inference_batch(["text"]) is scores
+
+                mock_pool.assert_awaited_once_with(["text"], None)
+                mock_load.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_worker_pool_model_reported_loaded(self):
+        """Test that a model loaded by the workers is reported by this process."""
+        scores = np.array([score_vector({"harassment": 0.9})])
+        with patch("app.config.settings.settings.inference_workers", 2):
+            # No pool: the worker function runs in the default executor
+            with patch(
+                "app.services.inference_pool.get_inference_pool", return_value=None
+            ), patch(
+                "app.services.inference_pool._worker_predict",
+                return_value=(scores, "unitary/toxic-bert", 12.5),
+            ):
+                assert not is_model_loaded()
+
+                await run_inference_batch(["text"])
+
+                assert is_model_loaded()
+                assert get_loaded_model_name() == "unitary/toxic-bert"
+                assert get_model_load_time() == 12.5
+
+    @pytest.mark.asyncio
+    async def test_broken_worker_pool_is_replaced(self):
+        """Test that a pool whose initializer failed is discarded, not reused."""
+        # The initializer raises in the worker, as a failed model load would
+        broken = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=int,
+            initargs=("not a number",),
+        )
+        with patch("app.services.inference_pool._pool", broken):
+            with pytest.raises(BrokenProcessPool):
+                await inference_pool.run_in_inference_pool(["text"])
+
+            assert inference_pool._pool is None
+
+    def test_worker_keeps_recent_models_loaded(self):
+        """Test that alternating between models does not reload them."""
+        inference_pool._worker_models.clear()
+        with patch(
+            "app.services.moderation._load_model_sync",
+            side_effect=lambda name: (f"model-{name}", "tokenizer", None),
+        ) as mock_load, patch("app.services.moderation._bind_tokenizer"):
+            for name in ["a", "b", "a", "b"]:
+                assert inference_pool._ensure_worker_model(name)[0] == f"model-{name}"
+
+            assert mock_load.call_count == 2
+        inference_pool._worker_models.clear()
+
+
+class TestBatchRunner:
+    """Test cases for cross-request micro-batching."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_submits_share_one_batch(self):
+        """Test that concurrent callers are scored in one call and get their own results."""
+        run_batch = AsyncMock(side_effect=lambda texts, model_name: [t.upper() for t in texts])
+        runner = BatchRunner(run_batch, max_batch_size=32, max_wait_ms=5)
+
+        first, second = await asyncio.gather(
+            runner.submit(["a", "b"]), runner.submit(["c"])
+        )
+
+        assert first == ["A", "B"]
+        assert second == ["C"]
+        run_batch.assert_awaited_once_with(["a", "b", "c"], None)
+
+    @pytest.mark.asyncio
+    async def test_batch_split_at_max_size(self):
+        """Test that a full batch runs without waiting and the rest runs separately."""
+        run_batch = AsyncMock(side_effect=lambda texts, model_name: list(texts))
+        runner = BatchRunner(run_batch, max_batch_size=2, max_wait_ms=5)
+
+        results = await runner.submit(["a", "b", "c"])
+
+        assert results == ["a", "b", "c"]
+        assert [c.args[0] for c in run_batch.await_args_list] == [["a", "b"], ["c"]]
+
+    @pytest.mark.asyncio
+    async def test_batch_error_propagates(self):
+        """Test that a failed batch raises in every waiting caller."""
+        run_batch = AsyncMock(side_effect=RuntimeError("model failed"))
+        runner = BatchRunner(run_batch, max_batch_size=32, max_wait_ms=1)
+
+        with pytest.raises(RuntimeError):
+            await runner.submit(["a"])
+
 
 class TestHealthService:
     """Test cases for health service."""